@@ -2,29 +2,57 @@
 
 
 
-from fastapi import APIRouter, BackgroundTasks, Request
+from fastapi import APIRouter, BackgroundTasks, Request, Response
 from fastapi.responses import StreamingResponse
 import traceback
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, field_serializer
 from typing import List, Dict, Any, Optional, Set
 import asyncio
 import aiohttp
 import time
 import random
-from dataclasses import dataclass
+import secrets
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import json
 import re
-from urllib.parse import urljoin, urlparse
+import threading
+from urllib.parse import urljoin, urlparse, urlencode, parse_qsl
 from pathlib import Path
+import codecs
+import hashlib
+from html import unescape
+import zipfile
 import csv
+import io
+import os
 from datetime import datetime, timedelta
-from collections import deque
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 try:
     import httpx
 except Exception:  # Defer hard import errors to runtime usage paths
     httpx = None  # type: ignore
-from bs4 import BeautifulSoup
+try:
+    import h2  # noqa: F401  (httpx[http2] backend)
+except Exception:  # Optional; httpx stays on HTTP/1.1 without it
+    h2 = None  # type: ignore
+try:
+    import re2
+except Exception:  # Optional linear-time regex engine for the JSON-LD scan; stdlib re is used when missing
+    re2 = None  # type: ignore
+try:
+    import orjson
+except Exception:  # Optional accelerator; stdlib json is used when missing
+    orjson = None  # type: ignore
+try:
+    import redis.asyncio as aioredis
+except Exception:  # Optional shared task store; in-process dicts are used when missing
+    aioredis = None  # type: ignore
+import lxml.html
+from lxml import etree
 from app.libs.product_matcher import create_product_matcher, ProductMatch
 from app.libs.database import (
     save_scraped_products,
@@ -67,6 +95,28 @@ class ScrapedProduct(BaseModel):
     match_reasoning: Optional[str] = None
     raw_data: Dict[str, Any] = Field(default_factory=dict)
 
+
+@dataclass(slots=True, kw_only=True)
+class ScrapedProductRecord:
+    """Pipeline-side twin of ScrapedProduct (same fields, same order): the scrapers, matching,
+    CSV export and storage work on these, and only API responses build the validated model."""
+    store_name: str
+    product_id: Optional[str] = None
+    title: str
+    price: Optional[float] = None
+    currency: str = "USD"
+    brand: Optional[str] = None
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    product_url: str
+    in_stock: bool = True
+    scraped_at: datetime
+    search_term: Optional[str] = None
+    match_score: Optional[float] = None
+    match_confidence: Optional[str] = None
+    match_reasoning: Optional[str] = None
+    raw_data: Dict[str, Any] = field(default_factory=dict)
+
 class ScrapingProgress(BaseModel):
     status: ScrapingStatus
     current_store: Optional[str] = None
@@ -74,8 +124,13 @@ class ScrapingProgress(BaseModel):
     total_stores: int = 0
     products_found: int = 0
     errors: List[str] = Field(default_factory=list)
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    # Epoch seconds from time.time() on the write path; rendered as ISO strings only when serialized
+    started_at: Optional[float] = None
+    completed_at: Optional[float] = None
+
+    @field_serializer("started_at", "completed_at")
+    def _iso_timestamp(self, value: Optional[float]) -> Optional[str]:
+        return datetime.fromtimestamp(value).isoformat() if value is not None else None
 
 class ScrapingRequest(BaseModel):
     target_products: List[str]  # Product names to search for
@@ -115,9 +170,73 @@ TARGET_STORES = [
     StoreInfo(name="Green Eco Dream", base_url="https://greenecodream.com", search_path="/search")
 ]
 
-# Global storage for scraping tasks
-scraping_tasks: Dict[str, ScrapingProgress] = {}
-scraping_results: Dict[str, List[ScrapedProduct]] = {}
+class _TaskStore(OrderedDict):
+    """Per-task dict that forgets old tasks: entries expire after ``ttl`` seconds and at most
+    ``maxlen`` are kept (oldest dropped first). Pruning happens on insert, the only way it grows.
+
+    Only touched from the event loop, so no locking; a running task keeps its own reference to its
+    progress object, so an evicted entry merely stops being pollable.
+    """
+
+    def __init__(self, maxlen: int = 512, ttl: float = 6 * 3600):
+        super().__init__()
+        self.maxlen = maxlen
+        self.ttl = ttl
+        self._stored_at: Dict[str, float] = {}
+
+    def __setitem__(self, key, value):
+        now = time.monotonic()
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        self._stored_at[key] = now
+        while self and (len(self) > self.maxlen or now - self._stored_at[next(iter(self))] > self.ttl):
+            oldest, _ = self.popitem(last=False)
+            self._stored_at.pop(oldest, None)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._stored_at.pop(key, None)
+
+
+# Global storage for scraping tasks (bounded; finished runs are also kept in the storage backend)
+scraping_tasks: Dict[str, ScrapingProgress] = _TaskStore()
+scraping_results: Dict[str, List[ScrapedProductRecord]] = _TaskStore()
+
+# With REDIS_URL set, progress/results are mirrored to Redis as pre-serialized JSON so any
+# uvicorn worker can answer the polling endpoints, not just the one running the task
+_redis = aioredis.Redis.from_url(os.environ["REDIS_URL"]) if aioredis is not None and os.getenv("REDIS_URL") else None
+_TASK_TTL_SECONDS = 3600
+_PRODUCTS_ADAPTER = TypeAdapter(List[ScrapedProductRecord])
+_PRODUCT_ADAPTER = TypeAdapter(ScrapedProductRecord)
+
+
+async def _publish_progress(task_id: str, progress: ScrapingProgress) -> None:
+    if _redis is None:
+        return
+    try:
+        await _redis.set(f"scrape:{task_id}", progress.model_dump_json(), ex=_TASK_TTL_SECONDS)
+    except Exception as e:
+        print(f"Failed to publish progress for {task_id}: {e}")
+
+
+async def _publish_results(task_id: str, products: List[ScrapedProductRecord]) -> None:
+    if _redis is None:
+        return
+    try:
+        await _redis.set(f"scrape:{task_id}:results", _PRODUCTS_ADAPTER.dump_json(products), ex=_TASK_TTL_SECONDS)
+    except Exception as e:
+        print(f"Failed to publish results for {task_id}: {e}")
+
+
+async def _read_published(key: str) -> Optional[bytes]:
+    """Fetch a mirrored blob; None when Redis is off or unreachable so callers use in-process state"""
+    if _redis is None:
+        return None
+    try:
+        return await _redis.get(key)
+    except Exception as e:
+        print(f"Failed to read {key} from Redis: {e}")
+        return None
 
 # Map store names to base URLs for CSV export convenience
 STORE_URL_BY_NAME: Dict[str, str] = {s.name: s.base_url for s in TARGET_STORES}
@@ -139,11 +258,19 @@ SLOT_CATEGORIES: Dict[str, int] = {
 }
 
 
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+_NUMBER_CHARS_RE = re.compile(r"[\d\.,]+")
+_WORDS_RE = re.compile(r"[a-zA-Z]+")
+
+
+# The name/term helpers below are pure and called with heavily repeated inputs, so they are memoized
+@lru_cache(maxsize=4096)
 def _slugify(term: str) -> str:
-    s = re.sub(r"[^a-zA-Z0-9]+", "_", (term or "").strip().lower()).strip("_")
+    s = _SLUG_RE.sub("_", (term or "").strip().lower()).strip("_")
     return s or "products"
 
 
+@lru_cache(maxsize=4096)
 def _pluralize_label(s: str) -> str:
     s = s.strip()
     if not s:
@@ -154,6 +281,7 @@ def _pluralize_label(s: str) -> str:
     return s + "s"
 
 
+@lru_cache(maxsize=4096)
 def _pluralize_slug(slug: str) -> str:
     if not slug:
         return slug
@@ -162,7 +290,316 @@ def _pluralize_slug(slug: str) -> str:
     return slug + "s"
 
 
-def _export_products_csv(products: List[ScrapedProduct], search_term: str) -> Path:
+# Compiled once at import; scrape_product_page/search_store run these for every page
+_ASSET_URL_RE = re.compile(r'\.(?:jpg|png|gif|svg|ico|css|js)', re.IGNORECASE)
+# Paths ending in some other non-HTML file extension (.webp, .mp4, .pdf, ...) get a HEAD check first
+_SUSPECT_PATH_RE = re.compile(r'\.(?!html?$)[a-z0-9]{2,5}$', re.IGNORECASE)
+_PRICE_NUMBER_RE = re.compile(r'[\d,]+\.?\d*')
+_PRICE_NUMBER_FULL_RE = re.compile(r'^[\d,]+\.?\d*$')
+# Single-group patterns whose capture is the price itself, tried in order. Each is paired with a
+# literal every match must contain (lowercase), so a plain substring check on the lowered page
+# rules a pattern out before the regex engine walks the whole document for nothing.
+_PRICE_RES = [
+    (re.compile(p, re.IGNORECASE), anchor)
+    for p, anchor in (
+        (r'["\']price["\']\s*:\s*["\']?([\d,]+\.?\d*)["\']?', 'price'),
+        (r'\$([\d,]+\.?\d*)', '$'),
+        (r'€([\d,]+\.?\d*)', '€'),
+        (r'£([\d,]+\.?\d*)', '£'),
+    )
+]
+# Last resort: a number somewhere after a price/cost class attribute
+_CLASS_PRICE_RE = re.compile(r'class=["\'][^"\']*(price|cost)[^"\']*(["\']).+?([\d,]+\.?\d*)', re.IGNORECASE)
+_COMMA_STRIP = str.maketrans('', '', ',')
+_EXTRA_PRICE_RES = [
+    (re.compile(p, re.IGNORECASE), anchor)
+    for p, anchor in (
+        (r'€\s*([\d\.,]+)', '€'),
+        (r'£\s*([\d\.,]+)', '£'),
+        (r'₹\s*([\d\.,]+)', '₹'),
+        (r'INR\s*([\d\.,]+)', 'inr'),
+        (r'Rs\.?\s*([\d\.,]+)', 'rs'),
+    )
+]
+_JSON_BRAND_RE = re.compile(r'"brand"\s*:\s*"([^\"]+)"', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _price_float(value: Any) -> float:
+    """Convert a scraped price (number or thousands-separated string) to float."""
+    if type(value) in (int, float):
+        return float(value)
+    return float(str(value).translate(_COMMA_STRIP))
+
+
+# Product pages are read up to this many bytes; JSON-LD, title and price sit near the top
+_MAX_PAGE_BYTES = 256 * 1024
+# Listing pages are streamed up to this size, checked for enough product links every _LISTING_SCAN_BYTES
+_MAX_LISTING_BYTES = 2 * 1024 * 1024
+_LISTING_SCAN_BYTES = 64 * 1024
+_RAW_HREF_RE = re.compile(r"""href\s*=\s*["']([^"'<>]+)""", re.IGNORECASE)
+# RE2 (a DFA) scans pages in guaranteed linear time; the pattern is valid for both engines
+_JSON_LD_RE = (re2 or re).compile(r'(?i)<script[^>]*type=["\']application/ld\+json["\'][^>]*>([\s\S]*?)</script>')
+
+
+# Shopify markers live in <head>, so the first 128 KB of the homepage is enough to decide
+_SHOPIFY_HEAD_BYTES = 128 * 1024
+_SHOPIFY_CACHE_TTL = 3600.0
+_SHOPIFY_MARKERS_RE = re.compile(rb'Shopify\.theme|shopify\.com|window\.Shopify|shopify-section')
+
+
+def _has_shopify_headers(headers: Any) -> bool:
+    for name, value in headers.items():
+        name = name.lower()
+        if name.startswith('x-shopify') or name == 'x-shopid' or (name == 'powered-by' and 'shopify' in value.lower()):
+            return True
+    return False
+
+
+async def _read_capped(response: aiohttp.ClientResponse, limit: int) -> bytes:
+    """Read at most ``limit`` bytes of a response body without buffering the rest."""
+    buf = bytearray()
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        buf += chunk
+        if len(buf) >= limit:
+            break
+    return bytes(buf[:limit])
+
+
+def _decode_body(raw: bytes, charset: Optional[str]) -> str:
+    """Decode a body with its declared charset (UTF-8 when absent or unknown), no sniffing."""
+    try:
+        return raw.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+
+def _is_complete_product(data: Any) -> bool:
+    """True when a JSON-LD Product alone gives scrape_product_page its title, price and brand."""
+    if not isinstance(data, dict) or data.get('@type') != 'Product' or not data.get('name'):
+        return False
+    brand = data.get('brand')
+    offers = data.get('offers', {})
+    if not (brand.get('name') if isinstance(brand, dict) else brand) or not isinstance(offers, dict):
+        return False
+    price = offers.get('price') or offers.get('lowPrice')
+    try:
+        return bool(price) and bool(_price_float(price))
+    except (ValueError, TypeError):
+        return False
+
+
+def _incremental_decoder(charset: Optional[str]) -> codecs.IncrementalDecoder:
+    try:
+        return codecs.getincrementaldecoder(charset or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+async def _read_product_page(response: aiohttp.ClientResponse, limit: int = _MAX_PAGE_BYTES) -> tuple[str, List[Any]]:
+    """Stream at most ``limit`` bytes of a product page, decoding JSON-LD blocks as they close.
+
+    Reading stops early once the page's first JSON-LD Product is complete, since nothing after it
+    would be used. Blocks that can't be a Product (BreadcrumbList, Organization, WebSite...) are
+    skipped unparsed. Returns the HTML read so far and the decoded candidate blocks up to that Product.
+    """
+    decoder = _incremental_decoder(response.charset)
+    parts: List[str] = []
+    blocks: List[Any] = []
+    pending = ""  # text not yet matched against _JSON_LD_RE
+    product_seen = False
+    total = 0
+    async for chunk in response.content.iter_chunked(16 * 1024):
+        chunk = chunk[: limit - total]
+        total += len(chunk)
+        text = decoder.decode(chunk, final=total >= limit)
+        parts.append(text)
+        if not product_seen:
+            pending += text
+            if 'ld+json' in pending:
+                last_end = 0
+                for m in _JSON_LD_RE.finditer(pending):
+                    last_end = m.end()
+                    if '"Product"' not in m.group(1):
+                        continue
+                    try:
+                        data = _loads_json(m.group(1))
+                    except ValueError:
+                        continue
+                    blocks.append(data)
+                    if isinstance(data, dict) and data.get('@type') == 'Product':
+                        product_seen = True
+                        if _is_complete_product(data):
+                            return "".join(parts), blocks
+                        break
+                pending = pending[last_end:]
+            # Keep only a possibly unfinished <script ...> onwards for the next chunk
+            start = pending.lower().rfind('<script')
+            pending = pending[start:] if start >= 0 else pending[-16:]
+        if total >= limit:
+            break
+    else:
+        parts.append(decoder.decode(b"", final=True))
+    return "".join(parts), blocks
+
+
+async def _read_listing_page(response: aiohttp.ClientResponse, wanted: Optional[int] = None,
+                             limit: int = _MAX_LISTING_BYTES) -> str:
+    """Stream a search/collection page, stopping once ``wanted`` product-looking links have arrived.
+
+    The raw-text href count is only a stopping heuristic; callers still harvest URLs from a parse of
+    the returned (possibly truncated) HTML, which lxml reads without complaint.
+    """
+    decoder = _incremental_decoder(response.charset)
+    parts: List[str] = []
+    found: Set[str] = set()
+    tail = ""  # end of the previous scan window, so an href split across chunks is still seen
+    scan_from = 0  # index into parts of the first chunk not yet scanned
+    total = 0
+    since_scan = 0
+    async for chunk in response.content.iter_chunked(16 * 1024):
+        chunk = chunk[: limit - total]
+        total += len(chunk)
+        since_scan += len(chunk)
+        parts.append(decoder.decode(chunk))
+        if total >= limit:
+            break
+        if wanted is not None and since_scan >= _LISTING_SCAN_BYTES:
+            window = tail + "".join(parts[scan_from:])
+            for href in _RAW_HREF_RE.findall(window):
+                if _PRODUCT_HREF_RE.search(href) and not _SKIP_URL_RE.search(href):
+                    found.add(href)
+            if len(found) >= wanted:
+                break
+            tail = window[-1024:]
+            scan_from = len(parts)
+            since_scan = 0
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+# Listing pages past the first are requested this many at a time
+_PAGE_WINDOW = 4
+_TRACKING_PARAMS = {'fbclid', 'gclid', 'msclkid', 'mc_cid', 'mc_eid', '_pos', '_sid', '_ss', '_psq'}
+
+
+def _canonical_url(url: str) -> str:
+    """Key for "same product page": lowercase scheme/host, no fragment, tracking params dropped."""
+    parts = urlparse(url)
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in _TRACKING_PARAMS and not k.startswith('utm_')
+    ]
+    return parts._replace(
+        scheme=parts.scheme.lower(), netloc=parts.netloc.lower(), query=urlencode(query), fragment=''
+    ).geturl()
+
+
+def _product_signature(product: ScrapedProductRecord) -> tuple:
+    """Content key for "same product" across variant/template URLs of a store."""
+    return (product.title or '', product.brand or '', round(product.price or 0, 2))
+
+
+def _search_endpoint_templates(store: StoreInfo) -> tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+    """Search URL templates for a store as (first page, extra for page > 1, extra on Shopify); fill {q}/{page}.
+
+    Duplicates (a store whose search_path is already /search) are dropped so no URL is fetched twice.
+    """
+    base, path = store.base_url, store.search_path
+    first = (
+        f"{base}{path}?q={{q}}",
+        f"{base}/search?q={{q}}",
+        f"{base}/search?query={{q}}",
+        f"{base}/search?s={{q}}",
+        f"{base}/catalogsearch/result/?q={{q}}",
+    )
+    paged = (
+        f"{base}{path}?q={{q}}&page={{page}}",
+        f"{base}/search?q={{q}}&page={{page}}",
+        f"{base}/search?query={{q}}&page={{page}}",
+        f"{base}/collections/all?q={{q}}&page={{page}}",
+        f"{base}/collections/all?sort_by=best-selling&q={{q}}&page={{page}}",
+    )
+    shopify = (
+        f"{base}/collections/all?q={{q}}",
+        f"{base}/search/suggest.json?q={{q}}&resources[type]=product&resources[limit]=20",
+    )
+    return tuple(dict.fromkeys(first)), tuple(dict.fromkeys(paged)), shopify
+
+
+def _loads_json(data: str | bytes) -> Any:
+    """Decode JSON with orjson when available (surrounding whitespace is accepted either way)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Non-product sections and asset extensions, matched anywhere in a candidate URL
+_SKIP_URL_RE = re.compile(
+    r'cart|account|login|contact|about|blog|news|policy|terms|faq|support|help'
+    r'|\.(?:jpg|png|gif|svg|ico|css|js|pdf|zip)',
+    re.IGNORECASE,
+)
+# Links that look like product detail pages (/products/..., /item/..., /shop/...)
+_PRODUCT_HREF_RE = re.compile(r'/.*(?:product|item)|/shop/', re.IGNORECASE)
+# Same candidates, prefiltered inside libxml2 in a single pass so nav/footer links never reach Python
+_LOWER_HREF = "translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+_PRODUCT_HREF_XPATH = etree.XPath(
+    f"//a/@href[contains({_LOWER_HREF}, 'product') or contains({_LOWER_HREF}, 'item')"
+    f" or contains({_LOWER_HREF}, '/shop/')]",
+    smart_strings=False,
+)
+
+
+def _parse_html(html: str) -> Optional[lxml.html.HtmlElement]:
+    """Parse an HTML document once into an lxml tree (None when empty or unparseable)."""
+    if not html:
+        return None
+    try:
+        return lxml.html.fromstring(html)
+    except ValueError:
+        # lxml refuses str input carrying an XML encoding declaration; hand it bytes instead
+        try:
+            return lxml.html.fromstring(html.encode("utf-8", errors="replace"))
+        except (etree.ParserError, ValueError):
+            return None
+    except etree.ParserError:
+        return None
+
+
+# Product page lookups, compiled once and returning plain strings (no per-result tree back-references)
+_JSON_LD_XPATH = etree.XPath('//script[contains(@type, "ld+json")]/text()', smart_strings=False)
+_MICRODATA_PRICE_XPATH = etree.XPath('//*[@itemprop="price"]/@content | //*[@itemprop="price"]/text()', smart_strings=False)
+_META_PRICE_XPATHS = [etree.XPath('//meta[@property="product:price:amount"]/@content', smart_strings=False)]
+_TITLE_XPATHS = [
+    etree.XPath(expr, smart_strings=False)
+    for expr in ('//title/text()', '//h1/text()', '//meta[@property="og:title"]/@content')
+]
+_META_BRAND_XPATHS = [etree.XPath('//meta[@property="product:brand"]/@content', smart_strings=False)]
+
+
+def _first_xpath_text(tree: lxml.html.HtmlElement, expressions: List[etree.XPath]) -> Optional[str]:
+    """Return the first non-empty string produced by the given compiled XPaths, in priority order."""
+    for expr in expressions:
+        for value in expr(tree):
+            text = str(value).strip()
+            if text:
+                return text
+    return None
+
+
+# Exports are written through one large buffer and a single writerows call per file
+_CSV_BUFFER_BYTES = 1 << 20
+# Dedicated pool so multi-MB CSV writes never queue behind (or starve) the default executor
+_CSV_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="csv-export")
+
+
+async def _run_csv(fn, *args):
+    """Run a blocking CSV read/write on the CSV pool, keeping the event loop free"""
+    return await asyncio.get_running_loop().run_in_executor(_CSV_EXECUTOR, fn, *args)
+
+
+def _export_products_csv(products: List[ScrapedProductRecord], search_term: str) -> Path:
     """Write a single CSV file with scraped data only.
 
     Columns: category, store, product_name, price, search_term, store_url
@@ -183,25 +620,31 @@ def _export_products_csv(products: List[ScrapedProduct], search_term: str) -> Pa
     filtered = [p for p in products if (p.search_term or "").strip().lower() == search_term.strip().lower()]
     rows = filtered if filtered else products
 
-    with out_path.open("w", newline="", encoding="utf-8") as f:
+    # Stores outside TARGET_STORES fall back to their first product's origin, parsed once per store
+    store_urls: Dict[str, str] = {name: url for name, url in STORE_URL_BY_NAME.items() if url}
+
+    def store_url_for(p: ScrapedProductRecord) -> str:
+        store_url = store_urls.get(p.store_name)
+        if store_url is None:
+            try:
+                parsed = urlparse(p.product_url)
+                store_url = f"{parsed.scheme}://{parsed.netloc}"
+            except Exception:
+                store_url = ""
+            store_urls[p.store_name] = store_url
+        return store_url
+
+    with out_path.open("w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_BYTES) as f:
         writer = csv.writer(f)
         writer.writerow(["category", "store", "product_name", "price", "search_term", "store_url"])
-        for p in rows:
-            store = p.store_name
-            store_url = STORE_URL_BY_NAME.get(store)
-            if not store_url:
-                try:
-                    store_url = f"{urlparse(p.product_url).scheme}://{urlparse(p.product_url).netloc}"
-                except Exception:
-                    store_url = ""
-            writer.writerow([
-                category,
-                store or "",
-                p.title or "",
-                ("" if p.price is None else p.price),
-                search_term,
-                store_url or "",
-            ])
+        writer.writerows([
+            category,
+            p.store_name or "",
+            p.title or "",
+            ("" if p.price is None else p.price),
+            search_term,
+            store_url_for(p),
+        ] for p in rows)
     return out_path
 
 def _strip_currency_to_float(s: str | None) -> Optional[float]:
@@ -209,93 +652,117 @@ def _strip_currency_to_float(s: str | None) -> Optional[float]:
         return None
     try:
         # Remove everything except digits, comma and dot
-        m = re.findall(r"[\d\.,]+", s)
+        m = _NUMBER_CHARS_RE.search(s)
         if not m:
             return None
-        t = m[0].replace(",", "").strip()
+        t = m.group().replace(",", "").strip()
         return float(t) if t else None
     except Exception:
         return None
 
+# Keyword rules for catalog names, checked in priority order. A rule fires when every one of its
+# keyword groups has a hit; all hits for a name come from a single regex sweep. No keyword in a
+# table is a prefix of another, so the lookahead scan reports every occurrence.
+_CANONICAL_TERM_RULES: List[tuple[tuple[frozenset, ...], str]] = [
+    ((frozenset({"phone stand", "mobile stand", "phone holder"}),), "phone stand"),
+    ((frozenset({"sunglass", "eyewear"}), frozenset({"wood", "bamboo"})), "wooden sunglasses"),
+    ((frozenset({"sunglass", "eyewear"}),), "sunglasses"),
+    ((frozenset({"bottle", "thermos", "flask"}),), "water bottle"),
+    ((frozenset({"mug", "cup"}),), "coffee mug"),
+    ((frozenset({"notebook", "journal", "diary", "sketchbook"}),), "notebook"),
+    ((frozenset({"lunch box", "lunchbox", "bento", "tiffin"}),), "lunch box"),
+    ((frozenset({"eri"}), frozenset({"shawl", "stole"})), "eri silk shawl"),
+    ((frozenset({"pashmina", "cashmere", "merino", "yak"}), frozenset({"shawl", "stole", "wrap"})), "premium shawl"),
+    ((frozenset({"cotton"}), frozenset({"scarf", "stole"})), "cotton scarf"),
+    ((frozenset({"scarf", "shawl", "stole", "wrap"}),), "shawl"),
+    ((frozenset({"cushion", "pillow cover", "pillowcase"}),), "cushion cover"),
+    ((frozenset({"coaster", "placemat", "place mat", "table mat"}),), "coaster"),
+    ((frozenset({"towel"}),), "towel"),
+]
+_SLOT_RULES: List[tuple[tuple[frozenset, ...], str]] = [
+    ((frozenset({"sunglass", "eyewear"}),), "Sunglasses"),
+    ((frozenset({"bottle", "thermos", "flask"}),), "Bottles"),
+    ((frozenset({"phone", "mobile"}), frozenset({"stand", "holder", "case", "accessory", "mount"})), "Phone accessories"),
+    ((frozenset({"notebook", "journal", "diary", "sketchbook"}),), "Notebook"),
+    ((frozenset({"lunch box", "lunchbox", "bento", "tiffin"}),), "Lunchbox"),
+    ((frozenset({"eri"}), frozenset({"shawl", "stole"})), "Eri silk shawls"),
+    ((frozenset({"pashmina", "cashmere", "merino", "yak"}), frozenset({"shawl", "stole", "wrap"})), "Premium shawls"),
+    ((frozenset({"cotton"}), frozenset({"scarf"})), "Cotton scarf"),
+    ((frozenset({"scarf", "shawl", "stole", "wrap"}),), "Other scarves and shawls"),
+    ((frozenset({"cushion", "pillow cover", "pillowcase"}),), "Cushion covers"),
+    ((frozenset({"coaster", "placemat", "place mat", "table mat"}),), "Coasters & placements"),
+    ((frozenset({"towel"}),), "Towels"),
+]
+
+
+def _keyword_scanner(rules: List[tuple[tuple[frozenset, ...], str]]) -> re.Pattern:
+    keywords = sorted({k for groups, _ in rules for group in groups for k in group})
+    return re.compile("(?=(" + "|".join(re.escape(k) for k in keywords) + "))")
+
+
+_CANONICAL_TERM_SCAN = _keyword_scanner(_CANONICAL_TERM_RULES)
+_SLOT_SCAN = _keyword_scanner(_SLOT_RULES)
+
+
+def _first_rule(scan: re.Pattern, rules: List[tuple[tuple[frozenset, ...], str]], text: str) -> Optional[str]:
+    hits = set(scan.findall(text))
+    if not hits:
+        return None
+    for groups, result in rules:
+        if all(not hits.isdisjoint(group) for group in groups):
+            return result
+    return None
+
+
+@lru_cache(maxsize=4096)
 def _canonical_term_for_item(name: str) -> str:
     """Map a product name to a generic search term used across competitors.
 
     This intentionally prefers broad terms; our scraper later expands to synonyms.
     """
     n = (name or "").lower().strip()
-    # Specific common items first
-    if any(k in n for k in ["phone stand", "mobile stand", "phone holder", "cell phone stand"]):
-        return "phone stand"
-    if any(k in n for k in ["sunglass", "sunglasses", "eyewear"]):
-        if any(k in n for k in ["wood", "bamboo"]):
-            return "wooden sunglasses"
-        return "sunglasses"
-    if any(k in n for k in ["bottle", "thermos", "flask"]):
-        return "water bottle"
-    if any(k in n for k in ["mug", "coffee mug", "tea mug", "cup"]):
-        return "coffee mug"
-    if any(k in n for k in ["notebook", "journal", "diary", "sketchbook"]):
-        return "notebook"
-    if any(k in n for k in ["lunch box", "lunchbox", "bento", "tiffin"]):
-        return "lunch box"
-    if "eri" in n and any(k in n for k in ["shawl", "stole"]):
-        return "eri silk shawl"
-    if any(k in n for k in ["pashmina", "cashmere", "merino", "yak"]) and any(k in n for k in ["shawl", "stole", "wrap"]):
-        return "premium shawl"
-    if "cotton" in n and any(k in n for k in ["scarf", "stole"]):
-        return "cotton scarf"
-    if any(k in n for k in ["scarf", "shawl", "stole", "wrap"]):
-        return "shawl"
-    if any(k in n for k in ["cushion cover", "pillow cover", "pillowcase", "cushion"]):
-        return "cushion cover"
-    if any(k in n for k in ["coaster", "placemat", "place mat", "table mat"]):
-        return "coaster"
-    if any(k in n for k in ["towel", "hand towel", "bath towel", "kitchen towel", "tea towel"]):
-        return "towel"
+    # Specific common items first (see _CANONICAL_TERM_RULES)
+    term = _first_rule(_CANONICAL_TERM_SCAN, _CANONICAL_TERM_RULES, n)
+    if term:
+        return term
     # Fallback to a cleaned term
     # keep 2 important words
-    words = re.findall(r"[a-zA-Z]+", n)
+    words = _WORDS_RE.findall(n)
     base = " ".join(words[:2]) if words else "product"
     return base or "product"
 
+@lru_cache(maxsize=4096)
 def _slot_for_item(name: str) -> tuple[Optional[str], Optional[int]]:
-    n = (name or "").lower()
-    def slot(s: str) -> tuple[str, int]:
-        return s, SLOT_CATEGORIES[s]
-    if any(k in n for k in ["sunglass", "sunglasses", "eyewear"]):
-        return slot("Sunglasses")
-    if any(k in n for k in ["bottle", "thermos", "flask"]):
-        return slot("Bottles")
-    if ("phone" in n or "mobile" in n) and any(k in n for k in ["stand", "holder", "case", "accessory", "mount"]):
-        return slot("Phone accessories")
-    if any(k in n for k in ["notebook", "journal", "diary", "sketchbook"]):
-        return slot("Notebook")
-    if any(k in n for k in ["lunch box", "lunchbox", "bento", "tiffin"]):
-        return slot("Lunchbox")
-    if "eri" in n and any(k in n for k in ["shawl", "stole"]):
-        return slot("Eri silk shawls")
-    if any(k in n for k in ["pashmina", "cashmere", "merino", "yak"]) and any(k in n for k in ["shawl", "stole", "wrap"]):
-        return slot("Premium shawls")
-    if "cotton" in n and "scarf" in n:
-        return slot("Cotton scarf")
-    if any(k in n for k in ["scarf", "shawl", "stole", "wrap"]):
-        return slot("Other scarves and shawls")
-    if any(k in n for k in ["cushion", "pillow cover", "pillowcase"]):
-        return slot("Cushion covers")
-    if any(k in n for k in ["coaster", "placemat", "place mat", "table mat"]):
-        return slot("Coasters & placements")
-    if "towel" in n:
-        return slot("Towels")
-    return None, None
+    s = _first_rule(_SLOT_SCAN, _SLOT_RULES, (name or "").lower())
+    if s is None:
+        return None, None
+    return s, SLOT_CATEGORIES[s]
+
+# Parsed catalog keyed by the file's (mtime_ns, size); re-read only when the file changes
+_catalog_cache: tuple[tuple[int, int], list[CatalogItem]] | None = None
+_catalog_lock = threading.Lock()
+
 
 def _read_catalog_csv() -> list[CatalogItem]:
     """Load catalog CSV from repo root and return parsed items with inferred fields."""
+    global _catalog_cache
     # Resolve repo root as in _export_products_csv
     repo_root = Path(__file__).resolve().parents[4]
     csv_path = repo_root / "Dzukou_Pricing_Overview_With_Names - Copy.csv"
+    try:
+        st = csv_path.stat()
+    except OSError:
+        return []
+    key = (st.st_mtime_ns, st.st_size)
+    with _catalog_lock:
+        if _catalog_cache is None or _catalog_cache[0] != key:
+            _catalog_cache = (key, _parse_catalog_csv(csv_path))
+        # Callers get their own list; the items themselves are never mutated
+        return list(_catalog_cache[1])
+
+
+def _parse_catalog_csv(csv_path: Path) -> list[CatalogItem]:
     items: list[CatalogItem] = []
-    if not csv_path.exists():
-        return items
     # Try utf-8-sig, fallback to latin-1
     encodings = ["utf-8-sig", "utf-8", "latin-1"]
     content: list[str] = []
@@ -321,111 +788,169 @@ def _read_catalog_csv() -> list[CatalogItem]:
         items.append(CatalogItem(name=name, code=code, price=price, cost=cost, category=cat, slot_percent=pct, canonical_term=term))
     return items
 
+_CATALOG_COLUMNS = ["name", "code", "price", "cost", "category_slot", "slot_percent", "canonical_search_term"]
+_CATALOG_SLOT_COLUMNS = ["name", "code", "price", "cost", "canonical_search_term", "slot_percent"]
+_CATALOG_TERM_COLUMNS = ["name", "code", "price", "cost", "category_slot", "slot_percent"]
+
+
+def _catalog_row(it: CatalogItem) -> list:
+    return [
+        it.name,
+        it.code or "",
+        ("" if it.price is None else it.price),
+        ("" if it.cost is None else it.cost),
+        it.category or "Uncategorized",
+        ("" if it.slot_percent is None else it.slot_percent),
+        it.canonical_term or "",
+    ]
+
+
+def _catalog_slot_row(it: CatalogItem) -> list:
+    return [
+        it.name,
+        it.code or "",
+        ("" if it.price is None else it.price),
+        ("" if it.cost is None else it.cost),
+        it.canonical_term or "",
+        ("" if it.slot_percent is None else it.slot_percent),
+    ]
+
+
+def _catalog_term_row(it: CatalogItem) -> list:
+    return [
+        it.name,
+        it.code or "",
+        ("" if it.price is None else it.price),
+        ("" if it.cost is None else it.cost),
+        it.category or "Uncategorized",
+        ("" if it.slot_percent is None else it.slot_percent),
+    ]
+
+
+def _group_catalog_by_slot(items: list[CatalogItem]) -> Dict[str, list[CatalogItem]]:
+    grouped: Dict[str, list[CatalogItem]] = {}
+    for it in items:
+        grouped.setdefault(it.category or "Uncategorized", []).append(it)
+    return grouped
+
+
+def _group_catalog_by_term(items: list[CatalogItem]) -> Dict[str, list[CatalogItem]]:
+    grouped: Dict[str, list[CatalogItem]] = {}
+    for it in items:
+        grouped.setdefault((it.canonical_term or "").strip() or "unknown", []).append(it)
+    return grouped
+
+
 def _export_catalog_assignment(items: list[CatalogItem]) -> Path:
     repo_root = Path(__file__).resolve().parents[4]
     out_dir = repo_root / "product_data"
     out_dir.mkdir(parents=True, exist_ok=True)
     out_path = out_dir / "catalog_categorized.csv"
-    with out_path.open("w", newline="", encoding="utf-8") as f:
+    with out_path.open("w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_BYTES) as f:
         writer = csv.writer(f)
-        writer.writerow(["name", "code", "price", "cost", "category_slot", "slot_percent", "canonical_search_term"])
-        for it in items:
-            writer.writerow([
-                it.name,
-                it.code or "",
-                ("" if it.price is None else it.price),
-                ("" if it.cost is None else it.cost),
-                it.category or "Uncategorized",
-                ("" if it.slot_percent is None else it.slot_percent),
-                it.canonical_term or "",
-            ])
+        writer.writerow(_CATALOG_COLUMNS)
+        writer.writerows(map(_catalog_row, items))
     return out_path
 
-def _export_catalog_per_slot(items: list[CatalogItem]) -> Dict[str, Path]:
+def _export_catalog_per_slot(items: list[CatalogItem]) -> Dict[str, str]:
     """Create a separate CSV for each slot/category with the catalog rows belonging to it."""
     repo_root = Path(__file__).resolve().parents[4]
     out_dir = repo_root / "product_data" / "catalog_by_slot"
     out_dir.mkdir(parents=True, exist_ok=True)
-    grouped: Dict[str, list[CatalogItem]] = {}
-    for it in items:
-        key = it.category or "Uncategorized"
-        grouped.setdefault(key, []).append(it)
-    paths: Dict[str, Path] = {}
-    for slot, rows in grouped.items():
-        slug = _slugify(slot)
-        p = out_dir / f"{slug}.csv"
-        with p.open("w", newline="", encoding="utf-8") as f:
+    # Paths are built as strings once so callers can return them without re-stringifying
+    out_prefix = f"{out_dir}{os.sep}"
+    paths: Dict[str, str] = {}
+    for slot, rows in _group_catalog_by_slot(items).items():
+        p = f"{out_prefix}{_slugify(slot)}.csv"
+        with open(p, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_BYTES) as f:
             w = csv.writer(f)
-            w.writerow(["name","code","price","cost","canonical_search_term","slot_percent"])
-            for it in rows:
-                w.writerow([
-                    it.name,
-                    it.code or "",
-                    ("" if it.price is None else it.price),
-                    ("" if it.cost is None else it.cost),
-                    it.canonical_term or "",
-                    ("" if it.slot_percent is None else it.slot_percent),
-                ])
+            w.writerow(_CATALOG_SLOT_COLUMNS)
+            w.writerows(map(_catalog_slot_row, rows))
         paths[slot] = p
     return paths
 
-def _export_catalog_per_term(items: list[CatalogItem]) -> Dict[str, Path]:
+def _export_catalog_per_term(items: list[CatalogItem]) -> Dict[str, str]:
     """Create a separate CSV for each canonical search term with the catalog rows mapped to it."""
     repo_root = Path(__file__).resolve().parents[4]
     out_dir = repo_root / "product_data" / "catalog_by_term"
     out_dir.mkdir(parents=True, exist_ok=True)
-    grouped: Dict[str, list[CatalogItem]] = {}
-    for it in items:
-        key = (it.canonical_term or "").strip() or "unknown"
-        grouped.setdefault(key, []).append(it)
-    paths: Dict[str, Path] = {}
-    for term, rows in grouped.items():
-        slug = _slugify(term)
-        p = out_dir / f"{slug}.csv"
-        with p.open("w", newline="", encoding="utf-8") as f:
+    # Paths are built as strings once so callers can return them without re-stringifying
+    out_prefix = f"{out_dir}{os.sep}"
+    paths: Dict[str, str] = {}
+    for term, rows in _group_catalog_by_term(items).items():
+        p = f"{out_prefix}{_slugify(term)}.csv"
+        with open(p, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_BYTES) as f:
             w = csv.writer(f)
-            w.writerow(["name","code","price","cost","category_slot","slot_percent"])
-            for it in rows:
-                w.writerow([
-                    it.name,
-                    it.code or "",
-                    ("" if it.price is None else it.price),
-                    ("" if it.cost is None else it.cost),
-                    it.category or "Uncategorized",
-                    ("" if it.slot_percent is None else it.slot_percent),
-                ])
+            w.writerow(_CATALOG_TERM_COLUMNS)
+            w.writerows(map(_catalog_term_row, rows))
         paths[term] = p
     return paths
 
+def _build_catalog_zip(items: list[CatalogItem]) -> bytes:
+    """Pack the categorized table plus every per-slot and per-term CSV into one DEFLATE archive,
+    laid out like product_data/ (catalog_by_slot/<slot>.csv, catalog_by_term/<term>.csv)."""
+    archive = io.BytesIO()
+    text = io.StringIO()
+    writer = csv.writer(text)
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        def add(name: str, columns: list, rows) -> None:
+            text.seek(0)
+            text.truncate(0)
+            writer.writerow(columns)
+            writer.writerows(rows)
+            zf.writestr(name, text.getvalue())
+
+        add("catalog_categorized.csv", _CATALOG_COLUMNS, map(_catalog_row, items))
+        for slot, rows in _group_catalog_by_slot(items).items():
+            add(f"catalog_by_slot/{_slugify(slot)}.csv", _CATALOG_SLOT_COLUMNS, map(_catalog_slot_row, rows))
+        for term, rows in _group_catalog_by_term(items).items():
+            add(f"catalog_by_term/{_slugify(term)}.csv", _CATALOG_TERM_COLUMNS, map(_catalog_term_row, rows))
+    return archive.getvalue()
+
 class TokenBucket:
-    """Rate limiting using token bucket algorithm"""
+    """Rate limiting using token bucket algorithm.
+
+    Kept as a schedule rather than a token count: ``_tat`` is the time at which the
+    bucket would be full again, so refill and reserve are one max() and one add, with
+    no lock (nothing awaits in between). A caller whose reservation pushes ``_tat`` more
+    than a full bucket past now sleeps off the difference, which keeps callers spaced.
+    """
     def __init__(self, rate: float, capacity: float = None):
         self.rate = rate  # tokens per second
         self.capacity = capacity or rate * 2
-        self.tokens = self.capacity
-        self.last_update = time.time()
-        self.lock = asyncio.Lock()
+        self._tat = 0.0
     
     async def acquire(self):
-        async with self.lock:
-            now = time.time()
-            # Add tokens based on elapsed time
-            self.tokens = min(self.capacity, self.tokens + (now - self.last_update) * self.rate)
-            self.last_update = now
-            
-            if self.tokens >= 1:
-                self.tokens -= 1
-                return True
-            else:
-                # Wait time to get next token
-                wait_time = (1 - self.tokens) / self.rate
-                await asyncio.sleep(wait_time)
-                self.tokens = 0
-                return True
+        now = asyncio.get_running_loop().time()
+        self._tat = max(self._tat, now) + 1.0 / self.rate
+        wait = self._tat - now - self.capacity / self.rate
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+
+# Product pages remembered per scraper (one run); least recently used are evicted past this
+_PAGE_CACHE_SIZE = 4096
+
 
 class CompetitorScraper:
     def __init__(self):
         self.rate_limiters = {store.name: TokenBucket(store.rate_limit) for store in TARGET_STORES}
+        # Caps in-flight product page fetches per store at the per-host request limit; pacing itself is left to rate_limiters
+        self.page_semaphores = {store.name: asyncio.Semaphore(8) for store in TARGET_STORES}
+        # Request slots (global and per host) taken before session.get, so time spent queued for a
+        # connection never counts against the 30s ClientTimeout and fan-out can't pile up on the pool
+        self._global_sem = asyncio.Semaphore(64)
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
+        # Product page fetches keyed by canonical URL, kept LRU-bounded after they finish; synonym,
+        # pagination and relaxed-threshold passes over the same page reuse the first fetch
+        self._inflight: OrderedDict[str, asyncio.Future] = OrderedDict()
+        # Shopify detection per base_url as (answer, monotonic timestamp); re-probed after _SHOPIFY_CACHE_TTL
+        self._shopify_cache: Dict[str, tuple[bool, float]] = {}
+        # Search endpoint templates per store, built once; collect_urls_for_term only fills {q}/{page}
+        self._endpoint_templates = {store.name: _search_endpoint_templates(store) for store in TARGET_STORES}
+        # Stateless once built, so one matcher serves every (store, query) of the run
+        self.matcher = create_product_matcher()
         self.session: Optional[aiohttp.ClientSession] = None
     
     async def __aenter__(self):
@@ -433,106 +958,145 @@ class CompetitorScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         timeout = aiohttp.ClientTimeout(total=30)
-        self.session = aiohttp.ClientSession(headers=headers, timeout=timeout)
+        # One pooled connector for every store: keep-alive and cached DNS let TCP/TLS
+        # setup be paid once per host rather than per request
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=8,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True,
+        )
+        self.session = aiohttp.ClientSession(headers=headers, timeout=timeout, connector=connector)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
     
+    def _host_sem(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = self._host_sems[host] = asyncio.Semaphore(8)
+        return sem
+    
     async def detect_shopify(self, url: str) -> bool:
-        """Detect if a site is using Shopify"""
+        """Detect if a site is using Shopify (answer cached per base_url for _SHOPIFY_CACHE_TTL)"""
+        cached = self._shopify_cache.get(url)
+        if cached is not None and time.monotonic() - cached[1] < _SHOPIFY_CACHE_TTL:
+            return cached[0]
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    # Common Shopify indicators
-                    shopify_indicators = [
-                        'Shopify.theme',
-                        'shopify.com',
-                        'cdn.shopify.com',
-                        'window.Shopify',
-                        'shopify-section'
-                    ]
-                    return any(indicator in text for indicator in shopify_indicators)
+            # Shopify's edge tags its responses (X-ShopId, X-Shopify-Stage, ...), so a HEAD usually settles it
+            async with self._global_sem, self._host_sem(url), self.session.head(url, allow_redirects=True) as head_resp:
+                is_shopify = _has_shopify_headers(head_resp.headers)
+            if is_shopify:
+                self._shopify_cache[url] = (True, time.monotonic())
+                return True
+            async with self._global_sem, self._host_sem(url), self.session.get(url) as response:
+                is_shopify = _has_shopify_headers(response.headers)
+                if not is_shopify and response.status == 200:
+                    # Common Shopify indicators (shopify.com also covers cdn.shopify.com), one pass over raw bytes
+                    head = await _read_capped(response, _SHOPIFY_HEAD_BYTES)
+                    is_shopify = _SHOPIFY_MARKERS_RE.search(head) is not None
         except Exception as e:
+            # Not cached: a network hiccup shouldn't pin the store to the generic endpoints
             print(f"Error detecting Shopify for {url}: {e}")
-        return False
+            return False
+        self._shopify_cache[url] = (is_shopify, time.monotonic())
+        return is_shopify
     
-    async def extract_json_ld(self, html: str) -> List[Dict]:
-        """Extract JSON-LD structured data"""
-        json_ld_pattern = r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>([\s\S]*?)</script>'
-        matches = re.findall(json_ld_pattern, html, re.IGNORECASE)
-        
+    async def extract_json_ld(self, tree: lxml.html.HtmlElement, schema_type: Optional[str] = None) -> List[Dict]:
+        """Extract JSON-LD structured data (only blocks mentioning ``schema_type`` are parsed, when given)"""
         json_ld_data = []
-        for match in matches:
+        marker = f'"{schema_type}"' if schema_type else None
+        for block in _JSON_LD_XPATH(tree):
+            if marker is not None and marker not in block:
+                continue
             try:
-                data = json.loads(match.strip())
+                data = _loads_json(block)
                 json_ld_data.append(data)
-            except json.JSONDecodeError:
+            except ValueError:
                 continue
         
         return json_ld_data
     
-    async def extract_microdata(self, html: str) -> Dict[str, Any]:
+    async def extract_microdata(self, tree: lxml.html.HtmlElement) -> Dict[str, Any]:
         """Extract microdata structured information"""
         # Simple microdata extraction for products
         product_data = {}
         
-        # Extract price
-        price_patterns = [
-            r'itemprop=["\']price["\'][^>]*content=["\']([^"\']*)["\']',
-            r'<span[^>]*itemprop=["\']price["\'][^>]*>([^<]*)</span>',
-        ]
-        
-        for pattern in price_patterns:
-            match = re.search(pattern, html, re.IGNORECASE)
-            if match:
-                try:
-                    price_text = match.group(1).strip()
-                    # Extract numeric price
-                    price_num = re.search(r'[\d,]+\.?\d*', price_text)
-                    if price_num:
-                        product_data['price'] = float(price_num.group().replace(',', ''))
-                        break
-                except (ValueError, AttributeError):
-                    continue
+        # Extract price (content attribute first, then element text)
+        for price_text in _MICRODATA_PRICE_XPATH(tree):
+            try:
+                # Extract numeric price
+                price_num = _PRICE_NUMBER_RE.search(str(price_text).strip())
+                if price_num:
+                    product_data['price'] = _price_float(price_num.group())
+                    break
+            except (ValueError, AttributeError):
+                continue
         
         return product_data
     
-    async def scrape_product_page(self, url: str, store_name: str, search_term: Optional[str] = None) -> Optional[ScrapedProduct]:
-        """Scrape individual product page"""
+    async def scrape_product_page(self, url: str, store_name: str, search_term: Optional[str] = None,
+                                  scraped_at: Optional[datetime] = None) -> Optional[ScrapedProductRecord]:
+        """Scrape individual product page (each distinct page is fetched once, while it stays cached)"""
+        key = _canonical_url(url)
+        fetch = self._inflight.get(key)
+        if fetch is None:
+            fetch = self._inflight[key] = asyncio.ensure_future(self._fetch_product_page(url, store_name, scraped_at))
+            if len(self._inflight) > _PAGE_CACHE_SIZE:
+                self._inflight.popitem(last=False)
+        else:
+            self._inflight.move_to_end(key)
+        product = await asyncio.shield(fetch)
+        if product is None:
+            return None
+        # Callers annotate (match_score, ...) their own copy
+        return replace(
+            product,
+            product_url=url,
+            search_term=(search_term or "").strip() or None,
+            scraped_at=scraped_at or product.scraped_at,
+        )
+    
+    async def _fetch_product_page(self, url: str, store_name: str,
+                                  scraped_at: Optional[datetime] = None) -> Optional[ScrapedProductRecord]:
         try:
             # Skip obvious non-product URLs
-            if any(ext in url.lower() for ext in ['.jpg', '.png', '.gif', '.svg', '.ico', '.css', '.js']):
+            if _ASSET_URL_RE.search(url):
                 return None
                 
             await self.rate_limiters[store_name].acquire()
             
-            async with self.session.get(url) as response:
+            if _SUSPECT_PATH_RE.search(urlparse(url).path):
+                async with self._global_sem, self._host_sem(url), self.session.head(url, allow_redirects=True) as head_resp:
+                    content_type = head_resp.headers.get('content-type', '')
+                    if content_type and 'text/html' not in content_type and 'application' not in content_type:
+                        return None
+            
+            async with self._global_sem, self._host_sem(url), self.session.get(url) as response:
                 if response.status != 200:
                     return None
                 
-                # Check content type
+                # Check content type before touching the body; release drops the unread payload
                 content_type = response.headers.get('content-type', '')
                 if 'text/html' not in content_type and 'application' not in content_type:
+                    response.release()
                     return None
                 
-                html = await response.text()
+                # Extract structured data; JSON-LD is decoded while the body streams in so a
+                # complete Product there needs neither the rest of the page nor a DOM parse
+                html, json_ld_data = await _read_product_page(response)
                 
-                # Extract structured data
-                json_ld_data = await self.extract_json_ld(html)
-                microdata = await self.extract_microdata(html)
-                
-                # Initialize product data
-                product = ScrapedProduct(
+                # Initialize product data; the response model validates once at serialization
+                product = ScrapedProductRecord(
                     store_name=store_name,
                     product_url=url,
                     title="",
-                    scraped_at=datetime.now(),
-                    raw_data={'html_length': len(html)}
+                    scraped_at=scraped_at or datetime.now(),
                 )
-                product.search_term = (search_term or "").strip() or None
                 
                 # Extract from JSON-LD first (most reliable)
                 for data in json_ld_data:
@@ -548,7 +1112,7 @@ class CompetitorScraper:
                             price_text = offers.get('price') or offers.get('lowPrice')
                             if price_text:
                                 try:
-                                    product.price = float(str(price_text).replace(',', ''))
+                                    product.price = _price_float(price_text)
                                     product.currency = offers.get('priceCurrency', 'USD')
                                 except ValueError:
                                     pass
@@ -558,69 +1122,73 @@ class CompetitorScraper:
                             product.in_stock = 'instock' in availability.lower() if availability else True
                         break
                 
-                # Fallback to microdata if JSON-LD didn't work
-                if not product.price and microdata.get('price'):
-                    product.price = microdata['price']
-                
-                # Fallback to HTML parsing if structured data failed
-                if not product.title:
-                    title_patterns = [
-                        r'<title[^>]*>([^<]*)</title>',
-                        r'<h1[^>]*>([^<]*)</h1>',
-                        r'property=["\']og:title["\'][^>]*content=["\']([^"\']*)["\']',
-                    ]
-                    for pattern in title_patterns:
-                        match = re.search(pattern, html, re.IGNORECASE)
-                        if match:
-                            product.title = match.group(1).strip()
-                            break
+                # Only parse the DOM when JSON-LD left the title or price missing
+                tree = None
+                if not product.title or not product.price:
+                    # The DOM parse is the CPU-heavy step; keep it off the event loop
+                    tree = await asyncio.to_thread(_parse_html, html)
+                    if tree is None:
+                        return None
+                    
+                    # Fallback to microdata if JSON-LD didn't work
+                    if not product.price:
+                        microdata = await self.extract_microdata(tree)
+                        if microdata.get('price'):
+                            product.price = microdata['price']
+                    if not product.price:
+                        meta_price = _first_xpath_text(tree, _META_PRICE_XPATHS)
+                        if meta_price:
+                            try:
+                                product.price = _price_float(meta_price)
+                            except ValueError:
+                                pass
+                    
+                    # Fallback to HTML parsing if structured data failed
+                    if not product.title:
+                        product.title = _first_xpath_text(tree, _TITLE_XPATHS) or ""
                 
                 # Enhanced price extraction if still missing
+                lowered = html.lower() if not product.price else ""
                 if not product.price:
-                    price_patterns = [
-                        r'["\']price["\']\s*:\s*["\']?([\d,]+\.?\d*)["\']?',
-                        r'\$([\d,]+\.?\d*)',
-                        r'€([\d,]+\.?\d*)',
-                        r'£([\d,]+\.?\d*)',
-                        r'class=["\'][^"\']*(price|cost)[^"\']*(["\']).+?([\d,]+\.?\d*)',
-                    ]
-                    for pattern in price_patterns:
-                        try:
-                            matches = re.findall(pattern, html, re.IGNORECASE)
-                            if matches:
-                                price_match = matches[0]
-                                if isinstance(price_match, tuple):
-                                    # Find the numeric part in the tuple
-                                    for part in price_match:
-                                        if re.match(r'^[\d,]+\.?\d*$', str(part)):
-                                            product.price = float(str(part).replace(',', ''))
-                                            break
-                                else:
-                                    product.price = float(str(price_match).replace(',', ''))
-                                break
-                        except (ValueError, IndexError, re.error):
+                    for pat, anchor in _PRICE_RES:
+                        if anchor not in lowered:
                             continue
+                        m = pat.search(html)
+                        if m:
+                            try:
+                                product.price = _price_float(m.group(1))
+                            except ValueError:
+                                continue
+                            break
+                    else:
+                        m = _CLASS_PRICE_RE.search(html) if 'class=' in lowered else None
+                        if m:
+                            # Find the numeric part among the groups
+                            for part in m.groups():
+                                if part and _PRICE_NUMBER_FULL_RE.match(part):
+                                    try:
+                                        product.price = _price_float(part)
+                                    except ValueError:
+                                        pass
+                                    break
                 # One more pass for common international currency symbols
                 if not product.price:
-                    extra_price_patterns = [
-                        r'€\s*([\d\.,]+)',
-                        r'£\s*([\d\.,]+)',
-                        r'₹\s*([\d\.,]+)',
-                        r'INR\s*([\d\.,]+)',
-                        r'Rs\.?\s*([\d\.,]+)'
-                    ]
-                    for pattern in extra_price_patterns:
+                    for pat, anchor in _EXTRA_PRICE_RES:
+                        if anchor not in lowered:
+                            continue
                         try:
-                            m = re.search(pattern, html, re.IGNORECASE)
+                            m = pat.search(html)
                             if m:
-                                product.price = float(m.group(1).replace(',', '').strip())
+                                product.price = _price_float(m.group(1).strip())
                                 break
                         except Exception:
                             continue
                 
                 # Extract brand if missing
+                if not product.brand and tree is not None:
+                    product.brand = _first_xpath_text(tree, _META_BRAND_XPATHS)
                 if not product.brand:
-                    match = re.search(r'"brand"\s*:\s*"([^\"]+)"', html, re.IGNORECASE)
+                    match = _JSON_BRAND_RE.search(html)
                     if match:
                         product.brand = match.group(1).strip()
                 
@@ -649,15 +1217,28 @@ class CompetitorScraper:
             print(f"Error scraping {url}: {e}")
             return None
     
-    async def search_store(self, store: StoreInfo, query: str, min_products: int, target_product: str) -> List[ScrapedProduct]:
+    async def scrape_product_pages(self, urls: List[str], store_name: str, search_term: Optional[str] = None,
+                                   scraped_at: Optional[datetime] = None) -> List[Optional[ScrapedProductRecord]]:
+        """Scrape several product pages of one store concurrently, preserving input order"""
+        semaphore = self.page_semaphores[store_name]
+
+        async def bounded(url: str) -> Optional[ScrapedProductRecord]:
+            async with semaphore:
+                return await self.scrape_product_page(url, store_name, search_term, scraped_at)
+
+        results = await asyncio.gather(*[bounded(u) for u in urls], return_exceptions=True)
+        return [None if isinstance(r, BaseException) else r for r in results]
+    
+    async def search_store(self, store: StoreInfo, query: str, min_products: int, target_product: str) -> List[ScrapedProductRecord]:
         """Search for products in a specific store with enhanced methods and pagination.
 
         Ensures at least ``min_products`` items with price are returned when possible.
         """
-        products: List[ScrapedProduct] = []
-        matcher = create_product_matcher()
+        products: List[ScrapedProductRecord] = []
 
         desired = max(17, min_products)
+        # One timestamp for the whole batch; per-product resolution isn't needed for price snapshots
+        batch_started = datetime.now()
 
         try:
             # Detect if Shopify (enables extra endpoints)
@@ -683,41 +1264,33 @@ class CompetitorScraper:
                     terms.update({t.replace("stole", "scarf"), t.replace("stole", "shawl")})
                 return list(terms)
 
-            async def collect_urls_for_term(term: str, page: int = 1) -> List[str]:
-                q = re.sub(r"\s+", "+", term.strip())
-                endpoints = [
-                    f"{store.base_url}{store.search_path}?q={q}",
-                    f"{store.base_url}/search?q={q}",
-                    f"{store.base_url}/search?query={q}",
-                    f"{store.base_url}/search?s={q}",
-                    f"{store.base_url}/catalogsearch/result/?q={q}",
-                ]
-                if page > 1:
-                    endpoints.extend([
-                        f"{store.base_url}{store.search_path}?q={q}&page={page}",
-                        f"{store.base_url}/search?q={q}&page={page}",
-                        f"{store.base_url}/search?query={q}&page={page}",
-                        f"{store.base_url}/collections/all?q={q}&page={page}",
-                        f"{store.base_url}/collections/all?sort_by=best-selling&q={q}&page={page}",
-                    ])
-                if is_shopify:
-                    endpoints.extend([
-                        f"{store.base_url}/collections/all?q={q}",
-                        f"{store.base_url}/search/suggest.json?q={q}&resources[type]=product&resources[limit]=20",
-                    ])
+            first_templates, paged_templates, shopify_templates = (
+                self._endpoint_templates.get(store.name) or _search_endpoint_templates(store)
+            )
+            if not is_shopify:
+                shopify_templates = ()
+
+            async def collect_urls_for_term(term: str, page: int = 1, wanted: Optional[int] = None) -> List[str]:
+                q = _WHITESPACE_RE.sub("+", term.strip())
+                # Unpaged endpoints return the same listing for every page, so they are only hit for page 1
+                templates = paged_templates if page > 1 else first_templates + shopify_templates
+                endpoints = [t.format(q=q, page=page) for t in templates]
 
                 product_urls: set[str] = set()
                 for url in endpoints:
+                    # Enough candidates already; the remaining endpoints would only add more to discard
+                    if wanted is not None and len(product_urls) >= wanted:
+                        break
                     try:
                         await self.rate_limiters[store.name].acquire()
-                        async with self.session.get(url) as resp:
+                        async with self._global_sem, self._host_sem(url), self.session.get(url) as resp:
                             if resp.status != 200:
                                 continue
                             # JSON suggest endpoint
                             ct = resp.headers.get("Content-Type", "")
                             if url.endswith("suggest.json") or "json" in ct:
                                 try:
-                                    data = await resp.json()
+                                    data = _loads_json(await resp.read())
                                     # Common Shopify suggest shapes
                                     candidates = []
                                     if isinstance(data, dict):
@@ -736,51 +1309,40 @@ class CompetitorScraper:
                                     pass
                                 continue
 
-                            html = await resp.text()
+                            html = await _read_listing_page(resp, wanted)
+                            tree = await asyncio.to_thread(_parse_html, html)
+                            if tree is None:
+                                continue
                             # Harvest from JSON-LD ItemList if present
                             try:
-                                for m in re.findall(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>([\s\S]*?)</script>', html, re.IGNORECASE):
-                                    try:
-                                        data = json.loads(m.strip())
-                                        items = []
-                                        if isinstance(data, dict) and data.get("@type") == "ItemList":
-                                            items = data.get("itemListElement", [])
-                                        if isinstance(items, list):
-                                            for it in items:
-                                                if isinstance(it, dict):
-                                                    url_field = it.get("url") or (it.get("item") or {}).get("url")
-                                                    if url_field:
-                                                        product_urls.add(urljoin(store.base_url, url_field))
-                                    except Exception:
-                                        continue
+                                for data in await self.extract_json_ld(tree, "ItemList"):
+                                    items = []
+                                    if isinstance(data, dict) and data.get("@type") == "ItemList":
+                                        items = data.get("itemListElement", [])
+                                    if isinstance(items, list):
+                                        for it in items:
+                                            if isinstance(it, dict):
+                                                url_field = it.get("url") or (it.get("item") or {}).get("url")
+                                                if url_field:
+                                                    product_urls.add(urljoin(store.base_url, url_field))
                             except Exception:
                                 pass
 
-                            # Regex-based URL harvesting
-                            url_patterns = [
-                                r'href=["\']([^"\']*/products?/[^"\']*)["\']',
-                                r'href=["\']([^"\']*/collections/[^"\']*/products/[^"\']*)["\']',
-                                r'href=["\']([^"\']*/items?/[^"\']*)["\']',
-                                r'href=["\']([^"\']*/product/[^"\']*)["\']',
-                                r'href=["\']([^"\']*/shop/[^"\']*)["\']',
-                                r'<a[^>]*href=["\']([^"\']*/[^"\']*(product|item)[^"\']*)["\']',
-                            ]
-                            for pattern in url_patterns:
-                                matches = re.findall(pattern, html, re.IGNORECASE)
-                                for match in matches:
-                                    u = match if isinstance(match, str) else match[0]
-                                    if u.startswith('/'):
-                                        full = urljoin(store.base_url, u)
-                                    elif u.startswith('http'):
-                                        full = u
-                                    else:
-                                        continue
-                                    low = full.lower()
-                                    if any(skip in low for skip in ['cart', 'account', 'login', 'contact', 'about', 'blog', 'news', 'policy', 'terms', 'faq', 'support', 'help']):
-                                        continue
-                                    if any(ext in low for ext in ['.jpg', '.png', '.gif', '.svg', '.ico', '.css', '.js', '.pdf', '.zip']):
-                                        continue
-                                    product_urls.add(full)
+                            # Anchor-based URL harvesting from the parsed tree
+                            for u in _PRODUCT_HREF_XPATH(tree):
+                                if not _PRODUCT_HREF_RE.search(u):
+                                    continue
+                                if u.startswith('/'):
+                                    full = urljoin(store.base_url, u)
+                                elif u.startswith('http'):
+                                    full = u
+                                else:
+                                    continue
+                                if _SKIP_URL_RE.search(full):
+                                    continue
+                                product_urls.add(full)
+                                if wanted is not None and len(product_urls) >= wanted:
+                                    break
                     except Exception:
                         continue
                 return list(product_urls)
@@ -788,47 +1350,76 @@ class CompetitorScraper:
             # Multi-strategy harvesting until we meet desired minimum per term
             scraped_count = 0
             seen_urls: set[str] = set()
+            # (title, brand, price) of products already taken; variant/template URLs of the same
+            # product are neither matched again nor added twice
+            seen_sigs: set[tuple] = set()
             for term in generate_search_terms(query):
                 page = 1
-                # Try up to 12 pages or until we hit desired
+                # Try up to 12 pages or until we hit desired: page 1 alone (often enough), then
+                # _PAGE_WINDOW pages at a time, whose listings are independent and fetched concurrently
                 while scraped_count < desired and page <= 12:
-                    urls = await collect_urls_for_term(term, page)
-                    new_urls = [u for u in urls if u not in seen_urls]
+                    pages = range(page, min(page + (_PAGE_WINDOW if page > 1 else 1), 13))
+                    page = pages[-1] + 1
+                    # Ask for a page's worth of links beyond the shortfall (2x, like the fetch batches)
+                    wanted = (desired - scraped_count) * 2 + len(seen_urls)
+                    harvested = await asyncio.gather(
+                        *(collect_urls_for_term(term, p, wanted) for p in pages), return_exceptions=True
+                    )
+                    new_urls = []
+                    for urls in harvested:
+                        if isinstance(urls, BaseException):
+                            continue
+                        for u in urls:
+                            if u not in seen_urls:
+                                seen_urls.add(u)
+                                new_urls.append(u)
                     if not new_urls:
-                        page += 1
                         continue
-                    seen_urls.update(new_urls)
-                    for url in new_urls:
-                        if scraped_count >= desired:
-                            break
-                        product = await self.scrape_product_page(url, store.name, target_product)
-                        if product and product.price is not None:
-                            # Apply product matching
-                            match_result = matcher.match_product(target_product, {
-                                'title': product.title,
-                                'brand': product.brand,
-                                'description': product.description
-                            })
+                    pending = new_urls
+                    while pending and scraped_count < desired:
+                        # Fetch a batch sized to the remaining shortfall (2x to absorb misses)
+                        batch_size = (desired - scraped_count) * 2
+                        batch, pending = pending[:batch_size], pending[batch_size:]
+                        priced = []
+                        batch_sigs: set[tuple] = set()
+                        for p in await self.scrape_product_pages(batch, store.name, target_product, batch_started):
+                            if p and p.price is not None:
+                                sig = _product_signature(p)
+                                if sig not in seen_sigs and sig not in batch_sigs:
+                                    batch_sigs.add(sig)
+                                    priced.append(p)
+                        # Apply product matching to the whole batch at once
+                        match_results = await asyncio.to_thread(self.matcher.match_batch, target_product, [
+                            {'title': p.title, 'brand': p.brand, 'description': p.description}
+                            for p in priced
+                        ])
+                        for product, match_result in zip(priced, match_results):
+                            if scraped_count >= desired:
+                                break
                             # Lower threshold slightly to meet minimum while keeping relevance
                             if match_result.similarity_score >= 0.05:
                                 product.match_score = match_result.similarity_score
                                 product.match_confidence = match_result.confidence
                                 product.match_reasoning = match_result.reasoning
                                 products.append(product)
+                                seen_sigs.add(_product_signature(product))
                                 scraped_count += 1
-                                # small pacing
-                                await asyncio.sleep(0.25)
-                    page += 1
                 if scraped_count < desired:
                     # As a last resort for this term, relax matching threshold slightly and retry
-                    for url in list(seen_urls):
-                        if scraped_count >= desired:
-                            break
-                        product = await self.scrape_product_page(url, store.name, target_product)
-                        if product and product.price is not None and (product.match_score or 0) < 0.05:
-                            products.append(product)
-                            scraped_count += 1
-                            await asyncio.sleep(0.1)
+                    pending = list(seen_urls)
+                    while pending and scraped_count < desired:
+                        batch_size = (desired - scraped_count) * 2
+                        batch, pending = pending[:batch_size], pending[batch_size:]
+                        for product in await self.scrape_product_pages(batch, store.name, target_product, batch_started):
+                            if scraped_count >= desired:
+                                break
+                            if product and product.price is not None and (product.match_score or 0) < 0.05:
+                                sig = _product_signature(product)
+                                if sig in seen_sigs:
+                                    continue
+                                seen_sigs.add(sig)
+                                products.append(product)
+                                scraped_count += 1
 
         except Exception as e:
             print(f"Error searching {store.name}: {e}")
@@ -841,7 +1432,7 @@ async def scrape_competitors_background(task_id: str, request: ScrapingRequest):
     """Background task for scraping competitors"""
     progress = scraping_tasks[task_id]
     progress.status = ScrapingStatus.RUNNING
-    progress.started_at = datetime.now()
+    progress.started_at = time.time()
     progress.total_stores = len(TARGET_STORES)
     # Persist run start
     try:
@@ -853,43 +1444,48 @@ async def scrape_competitors_background(task_id: str, request: ScrapingRequest):
     
     try:
         async with CompetitorScraper() as scraper:
-            # Process stores concurrently with controlled concurrency
-            semaphore = asyncio.Semaphore(3)  # Limit concurrent stores
-            
             async def scrape_store_with_progress(store: StoreInfo):
-                async with semaphore:
-                    progress.current_store = store.name
-                    print(f"Starting scraping for {store.name}")
-                    
-                    store_products = []
-                    for product_name in request.target_products:
-                        print(f"Searching for '{product_name}' in {store.name}")
-                        products = await scraper.search_store(store, product_name, request.max_products_per_store, product_name)
-                        store_products.extend(products)
-                        
-                        # Add delay between product searches
-                        await asyncio.sleep(1.0)
-                    
-                    # Persist incrementally to storage (best-effort) for this run and latest snapshot
-                    if store_products:
-                        try:
-                            await save_scraped_products_for_run(store_products, task_id)
-                        except Exception as e:
-                            print(f"Store-level save failed for {store.name}: {e}")
-
-                    progress.completed_stores += 1
-                    progress.products_found += len(store_products)
-                    print(f"Completed {store.name}: found {len(store_products)} products")
+                progress.current_store = store.name
+                print(f"Starting scraping for {store.name}")
+                
+                store_products = []
+                for product_name in request.target_products:
+                    print(f"Searching for '{product_name}' in {store.name}")
+                    products = await scraper.search_store(store, product_name, request.max_products_per_store, product_name)
+                    # No fixed pause between searches: every request already waits on the store's token bucket
+                    store_products.extend(products)
+                
+                # Persist incrementally to storage (best-effort) for this run and latest snapshot
+                if store_products:
                     try:
-                        await update_scraping_run(task_id, progress.completed_stores, progress.products_found)
+                        await save_scraped_products_for_run(store_products, task_id)
                     except Exception as e:
-                        print(f"Failed to update run progress: {e}")
-                    
-                    return store_products
+                        print(f"Store-level save failed for {store.name}: {e}")
+
+                progress.completed_stores += 1
+                progress.products_found += len(store_products)
+                print(f"Completed {store.name}: found {len(store_products)} products")
+                await _publish_progress(task_id, progress)
+                try:
+                    await update_scraping_run(task_id, progress.completed_stores, progress.products_found)
+                except Exception as e:
+                    print(f"Failed to update run progress: {e}")
+                
+                return store_products
             
-            # Execute all store scraping tasks
-            tasks = [scrape_store_with_progress(store) for store in TARGET_STORES]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # One task per store: stores are distinct hosts, each paced by its own token bucket, and
+            # total fan-out is already capped by the scraper's global request semaphore
+            results: List[Any] = [None] * len(TARGET_STORES)
+
+            async def scrape_store_into(i: int, store: StoreInfo):
+                try:
+                    results[i] = await scrape_store_with_progress(store)
+                except Exception as e:
+                    results[i] = e
+
+            async with asyncio.TaskGroup() as tg:
+                for i, store in enumerate(TARGET_STORES):
+                    tg.create_task(scrape_store_into(i, store))
             
             # Process results
             for i, result in enumerate(results):
@@ -901,7 +1497,7 @@ async def scrape_competitors_background(task_id: str, request: ScrapingRequest):
         # Mark task as completed before any optional persistence work
         # Also normalize counters and clear transient state so the UI reflects completion immediately
         progress.status = ScrapingStatus.COMPLETED
-        progress.completed_at = datetime.now()
+        progress.completed_at = time.time()
         try:
             progress.completed_stores = progress.total_stores or progress.completed_stores
         except Exception:
@@ -911,6 +1507,8 @@ async def scrape_competitors_background(task_id: str, request: ScrapingRequest):
 
         # Store results in memory
         scraping_results[task_id] = all_products
+        await _publish_results(task_id, all_products)
+        await _publish_progress(task_id, progress)
 
         # Persist final snapshot (best-effort) also update run status
         try:
@@ -923,10 +1521,10 @@ async def scrape_competitors_background(task_id: str, request: ScrapingRequest):
         except Exception as e:
             print(f"Failed to finalize run: {e}")
         
-        # Export one CSV per search term, filtered to that term's rows
+        # Export one CSV per search term, filtered to that term's rows (file I/O off the event loop)
         try:
             for term in request.target_products or []:
-                path = _export_products_csv(all_products, term)
+                path = await _run_csv(_export_products_csv, all_products, term)
                 print(f"CSV exported to {path}")
         except Exception as e:
             print(f"CSV export failed: {e}")
@@ -937,6 +1535,7 @@ async def scrape_competitors_background(task_id: str, request: ScrapingRequest):
         if "DATABUTTON_PROJECT_ID" in msg or "databutton project id" in msg.lower():
             # Ensure results are accessible even if persistence failed
             scraping_results[task_id] = all_products
+            await _publish_results(task_id, all_products)
             progress.status = ScrapingStatus.COMPLETED
             progress.errors.append(
                 "Skipped persistence: missing Databutton config. Scrape completed successfully."
@@ -945,9 +1544,10 @@ async def scrape_competitors_background(task_id: str, request: ScrapingRequest):
             progress.status = ScrapingStatus.FAILED
             tb = traceback.format_exc()
             progress.errors.append(f"Fatal error: {msg}\n{tb}")
-        progress.completed_at = datetime.now()
+        progress.completed_at = time.time()
         # Clear transient state on terminal states (completed/failed)
         progress.current_store = None
+        await _publish_progress(task_id, progress)
         try:
             await finalize_scraping_run(task_id, progress.status.value if isinstance(progress.status, ScrapingStatus) else str(progress.status))
         except Exception as e2:
@@ -968,13 +1568,126 @@ class StoreStatus:
     rate_limit_delay: float = 1.0
 
 
+_RESILIENT_PRICE_RES = [
+    re.compile(p) for p in (r'\$([0-9,]+\.?[0-9]*)', r'€([0-9,]+\.?[0-9]*)', r'£([0-9,]+\.?[0-9]*)')
+]
+_RESILIENT_PRICE_TEXT_RE = re.compile(r'([0-9,]+\.?[0-9]*)')
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# ResilientScraper's CSS fallbacks as compiled XPaths over one lxml parse (document order, like soup.select)
+_RESILIENT_TITLE_XPATHS = [
+    etree.XPath(expr)
+    for expr in (
+        f'//h1[{_has_class("product-title")}]',
+        '//h1[@data-testid="product-title"]',
+        f'//*[{_has_class("product-name")}]//h1',
+        '//h1[@itemprop="name"]',
+        '//h1',
+    )
+]
+_RESILIENT_PRICE_XPATHS = [
+    etree.XPath(expr)
+    for expr in (
+        '//*[@data-testid="price"]',
+        f'//*[{_has_class("price-current")}]',
+        f'//*[{_has_class("product-price")}]',
+        f'//*[{_has_class("price")}]',
+        '//*[@itemprop="price"]',
+    )
+]
+# Search results only need the first few product links, so they are scanned straight off the raw HTML
+_RESILIENT_HREF_RE = re.compile(r"""<a\s[^>]*?\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE)
+_RESILIENT_PRODUCT_PATH_RE = re.compile(r'/product', re.IGNORECASE)
+
+
+_VISIBLE_TEXT_XPATH = etree.XPath(
+    'descendant::text()[not(ancestor::script or ancestor::style or ancestor::template)]', smart_strings=False
+)
+
+
+def _element_text(element: lxml.html.HtmlElement) -> str:
+    """Element text with each string stripped and joined, as BeautifulSoup's get_text(strip=True)."""
+    # Script/style/template text is skipped when nested, but is the text of such an element itself
+    strings = element.itertext() if element.tag in ('script', 'style', 'template') else _VISIBLE_TEXT_XPATH(element)
+    return "".join(s.strip() for s in strings)
+
+
+_USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+)
+_ACCEPT_LANGUAGES = (
+    'en-US,en;q=0.9',
+    'en-GB,en;q=0.9',
+    'en-US,en;q=0.8,es;q=0.7',
+    'en-CA,en;q=0.9',
+)
+# Static part of ResilientScraper's browser headers; User-Agent/Accept-Language slots are filled per request
+_BROWSER_HEADERS = {
+    'User-Agent': '',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': '',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'cross-site',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'no-cache',
+    'Pragma': 'no-cache',
+}
+
+# One httpx client for every ResilientScraper run, so DNS, TCP/TLS and HTTP/2 connections stay warm
+# between background tasks; closed on app shutdown
+_shared_client: Optional["httpx.AsyncClient"] = None
+
+
+def _get_shared_client() -> "httpx.AsyncClient":
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        # Pool limits and HTTP/2 belong on the transport: httpx ignores the client-level ones once a
+        # transport is passed. HTTP/2 multiplexes the store's requests over one TLS connection.
+        _shared_client = httpx.AsyncClient(
+            timeout=30.0,
+            follow_redirects=True,
+            transport=httpx.AsyncHTTPTransport(
+                retries=1,
+                http2=h2 is not None,
+                limits=httpx.Limits(max_keepalive_connections=100, max_connections=100, keepalive_expiry=60.0),
+            )
+        )
+    return _shared_client
+
+
+async def _close_shared_client() -> None:
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
+
+router.on_shutdown.append(_close_shared_client)
+
+
 class ResilientScraper:
     def __init__(self):
-        # Round-robin queue of stores to scrape
+        # Round-robin queue of stores to scrape; blocked stores are dropped lazily when popped
         self.store_queue = deque(TARGET_STORES)
         self.store_status: Dict[str, StoreStatus] = {
             store.name: StoreStatus(store.name) for store in TARGET_STORES
         }
+        self._stores_by_name: Dict[str, StoreInfo] = {store.name: store for store in TARGET_STORES}
+        self._queued: Set[str] = set(self._stores_by_name)
+        self._blocked: Set[str] = set()
 
         # Failed stores that need retry later
         self.retry_queue: List[StoreInfo] = []
@@ -990,87 +1703,56 @@ class ResilientScraper:
 
     def get_random_headers(self) -> Dict[str, str]:
         """Generate realistic, randomized browser headers"""
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        ]
-
-        accept_languages = [
-            'en-US,en;q=0.9',
-            'en-GB,en;q=0.9',
-            'en-US,en;q=0.8,es;q=0.7',
-            'en-CA,en;q=0.9',
-        ]
-
-        return {
-            'User-Agent': random.choice(user_agents),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': random.choice(accept_languages),
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'cross-site',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache',
-        }
+        headers = dict(_BROWSER_HEADERS)
+        headers['User-Agent'] = random.choice(_USER_AGENTS)
+        headers['Accept-Language'] = random.choice(_ACCEPT_LANGUAGES)
+        return headers
 
     async def __aenter__(self):
         if httpx is None:
             raise RuntimeError("httpx is required for ResilientScraper. Please install 'httpx'.")
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            follow_redirects=True,
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=20),
-            # Don't reuse connections too aggressively
-            transport=httpx.AsyncHTTPTransport(retries=1)
-        )
+        self.client = _get_shared_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.client:
-            await self.client.aclose()
+        # The client is shared across runs; _close_shared_client closes it on shutdown
+        self.client = None
 
     def get_next_store(self) -> Optional[StoreInfo]:
         """Get next available store from round-robin queue"""
         now = datetime.now()
 
         # Check retry queue first for stores that might be ready
-        ready_retries = []
-        for store in self.retry_queue[:]:
+        waiting = []
+        ready_retries = 0
+        for store in self.retry_queue:
             status = self.store_status[store.name]
             if status.retry_after and now >= status.retry_after:
-                ready_retries.append(store)
-                self.retry_queue.remove(store)
-                self.store_queue.append(store)
+                ready_retries += 1
+                self._blocked.discard(store.name)
+                if store.name not in self._queued:
+                    self._queued.add(store.name)
+                    self.store_queue.append(store)
                 status.is_blocked = False
                 status.consecutive_failures = 0
+            else:
+                waiting.append(store)
+        self.retry_queue = waiting
 
         if ready_retries:
-            print(f"Re-enabled {len(ready_retries)} stores from retry queue")
+            print(f"Re-enabled {ready_retries} stores from retry queue")
 
         # Try to find an available store
-        attempts = 0
-        while attempts < len(self.store_queue) * 2:  # Prevent infinite loop
-            if not self.store_queue:
-                break
-
+        while self.store_queue:
             store = self.store_queue.popleft()
-            status = self.store_status[store.name]
 
-            if not status.is_blocked:
+            if store.name not in self._blocked:
                 # Put it back at end of queue for next round
                 self.store_queue.append(store)
                 return store
 
             # Store is blocked, keep it out of main queue
-            attempts += 1
+            self._queued.discard(store.name)
 
         return None
 
@@ -1080,6 +1762,7 @@ class ResilientScraper:
         status.last_success = datetime.now()
         status.consecutive_failures = 0
         status.is_blocked = False
+        self._blocked.discard(store_name)
         print(f"✅ {store_name}: Success")
 
     def mark_store_failure(self, store_name: str, error: str):
@@ -1095,10 +1778,10 @@ class ResilientScraper:
             status.is_blocked = True
             status.retry_after = datetime.now() + self.retry_cooldown
 
-            # Move store to retry queue
-            store = next((s for s in self.store_queue if s.name == store_name), None)
-            if store:
-                self.store_queue.remove(store)
+            # Move store to retry queue (get_next_store drops it from store_queue when it comes up)
+            store = self._stores_by_name.get(store_name)
+            if store and store_name not in self._blocked:
+                self._blocked.add(store_name)
                 self.retry_queue.append(store)
 
             print(f"🚫 {store_name}: Blocked until {status.retry_after}")
@@ -1112,8 +1795,8 @@ class ResilientScraper:
         print(f"⏳ Waiting {delay:.1f}s...")
         await asyncio.sleep(delay)
 
-    async def scrape_with_bs4(self, url: str, store_name: str) -> Optional[ScrapedProduct]:
-        """Scrape a single product page with BeautifulSoup"""
+    async def scrape_with_bs4(self, url: str, store_name: str) -> Optional[ScrapedProductRecord]:
+        """Scrape a single product page (lxml parse, selector fallbacks)"""
         try:
             assert self.client is not None
             # Random headers per request
@@ -1129,17 +1812,13 @@ class ResilientScraper:
             elif response.status_code >= 400:
                 raise httpx.HTTPStatusError(f"HTTP {response.status_code}", request=response.request, response=response)
 
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Extract product data (simplified for example)
-            title = self.extract_title(soup)
-            price = self.extract_price(soup, response.text)
+            # Parse and extract off the event loop so other stores' requests keep flowing
+            title, price = await asyncio.to_thread(self._parse_and_extract, response.text)
 
             if not title or price is None:
                 return None
 
-            return ScrapedProduct(
+            return ScrapedProductRecord(
                 store_name=store_name,
                 product_url=url,
                 title=title,
@@ -1159,54 +1838,40 @@ class ResilientScraper:
         except Exception as e:
             raise Exception(f"Scraping error: {str(e)}")
 
-    def extract_title(self, soup: BeautifulSoup) -> Optional[str]:
+    def _parse_and_extract(self, html_text: str) -> tuple[Optional[str], Optional[float]]:
+        """Parse a product page and pull (title, price); synchronous, run in a worker thread"""
+        tree = _parse_html(html_text)
+        if tree is None:
+            return None, None
+        return self.extract_title(tree), self.extract_price(tree, html_text)
+
+    def extract_title(self, tree: lxml.html.HtmlElement) -> Optional[str]:
         """Extract product title with fallbacks"""
-        selectors = [
-            'h1.product-title',
-            'h1[data-testid="product-title"]',
-            '.product-name h1',
-            'h1[itemprop="name"]',
-            'h1',
-        ]
-
-        for selector in selectors:
-            element = soup.select_one(selector)
-            if element and element.get_text(strip=True):
-                return element.get_text(strip=True)[:200]  # Limit length
+        for xpath in _RESILIENT_TITLE_XPATHS:
+            elements = xpath(tree)
+            if elements:
+                title = _element_text(elements[0])
+                if title:
+                    return title[:200]  # Limit length
         return None
 
-    def extract_price(self, soup: BeautifulSoup, html_text: str) -> Optional[float]:
+    def extract_price(self, tree: lxml.html.HtmlElement, html_text: str) -> Optional[float]:
         """Extract price with multiple fallbacks"""
 
-        # Try CSS selectors first
-        price_selectors = [
-            '[data-testid="price"]',
-            '.price-current',
-            '.product-price',
-            '.price',
-            '[itemprop="price"]',
-        ]
-
-        for selector in price_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                price_text = element.get_text(strip=True)
+        # Try the selector XPaths first
+        for xpath in _RESILIENT_PRICE_XPATHS:
+            for element in xpath(tree):
+                price_text = _element_text(element)
                 price = self.parse_price_text(price_text)
                 if price:
                     return price
 
         # Fallback to regex
-        price_patterns = [
-            r'\$([0-9,]+\.?[0-9]*)',
-            r'€([0-9,]+\.?[0-9]*)',
-            r'£([0-9,]+\.?[0-9]*)',
-        ]
-
-        for pattern in price_patterns:
-            matches = re.findall(pattern, html_text)
-            if matches:
+        for pattern in _RESILIENT_PRICE_RES:
+            match = pattern.search(html_text)
+            if match:
                 try:
-                    return float(matches[0].replace(',', ''))
+                    return float(match.group(1).replace(',', ''))
                 except ValueError:
                     continue
 
@@ -1217,7 +1882,7 @@ class ResilientScraper:
         if not text:
             return None
 
-        price_match = re.search(r'([0-9,]+\.?[0-9]*)', text.replace(',', ''))
+        price_match = _RESILIENT_PRICE_TEXT_RE.search(text.replace(',', ''))
         if price_match:
             try:
                 return float(price_match.group(1))
@@ -1225,9 +1890,9 @@ class ResilientScraper:
                 pass
         return None
 
-    async def scrape_stores_round_robin(self, search_terms: List[str], max_products: int = 50) -> List[ScrapedProduct]:
+    async def scrape_stores_round_robin(self, search_terms: List[str], max_products: int = 50) -> List[ScrapedProductRecord]:
         """Main scraping method with round-robin and failure handling"""
-        all_products: List[ScrapedProduct] = []
+        all_products: List[ScrapedProductRecord] = []
         total_scraped = 0
 
         print(f"🚀 Starting round-robin scraping for {len(search_terms)} terms")
@@ -1237,8 +1902,14 @@ class ResilientScraper:
             store = self.get_next_store()
 
             if not store:
-                print("⚠️  No available stores, waiting for retry cooldowns...")
-                await asyncio.sleep(60)  # Wait 1 minute before checking retry queue
+                # Sleep until the earliest cooldown ends rather than polling on a fixed interval
+                next_retry = min(
+                    (self.store_status[s.name].retry_after for s in self.retry_queue if self.store_status[s.name].retry_after),
+                    default=None,
+                )
+                wait = max(0.5, (next_retry - datetime.now()).total_seconds()) if next_retry else 60
+                print(f"⚠️  No available stores, waiting {wait:.0f}s for retry cooldowns...")
+                await asyncio.sleep(wait)
                 continue
 
             print(f"\n🎯 Switching to {store.name}")
@@ -1270,15 +1941,16 @@ class ResilientScraper:
         print(f"\n🏁 Scraping complete: {total_scraped} total products from {len(set(p.store_name for p in all_products))} stores")
         return all_products
 
-    async def scrape_store(self, store: StoreInfo, search_terms: List[str]) -> List[ScrapedProduct]:
+    async def scrape_store(self, store: StoreInfo, search_terms: List[str]) -> List[ScrapedProductRecord]:
         """Scrape a single store for all search terms"""
-        products: List[ScrapedProduct] = []
+        products: List[ScrapedProductRecord] = []
         assert self.client is not None
+        search_base = f"{store.base_url}/search?q="
 
         for term in search_terms:
             try:
                 # Find product URLs for this term
-                search_url = f"{store.base_url}/search?q={term.replace(' ', '+')}"
+                search_url = search_base + term.replace(' ', '+')
 
                 # Get search results page
                 headers = self.get_random_headers()
@@ -1287,20 +1959,17 @@ class ResilientScraper:
                 if response.status_code != 200:
                     continue
 
-                # Extract product URLs (simplified)
-                soup = BeautifulSoup(response.text, 'html.parser')
-                product_links = soup.find_all('a', href=True)
-
+                # Extract product URLs (simplified), stopping at the per-term limit of 5
                 product_urls: List[str] = []
-                for link in product_links:
-                    href = link['href']
-                    if '/product' in href.lower():
-                        if href.startswith('/'):
-                            href = store.base_url + href
-                        product_urls.append(href)
-
-                # Limit products per search term
-                product_urls = product_urls[:5]
+                for m in _RESILIENT_HREF_RE.finditer(response.text):
+                    href = unescape(m.group(1) or m.group(2) or m.group(3) or "")
+                    if not _RESILIENT_PRODUCT_PATH_RE.search(href):
+                        continue
+                    if href.startswith('/'):
+                        href = store.base_url + href
+                    product_urls.append(href)
+                    if len(product_urls) == 5:
+                        break
 
                 # Scrape each product
                 for url in product_urls:
@@ -1331,7 +2000,7 @@ async def scrape_competitors_resilient(task_id: str, request: ScrapingRequest):
     """Updated background task using resilient round-robin scraper"""
     progress = scraping_tasks[task_id]
     progress.status = ScrapingStatus.RUNNING
-    progress.started_at = datetime.now()
+    progress.started_at = time.time()
 
     try:
         async with ResilientScraper() as scraper:
@@ -1342,14 +2011,16 @@ async def scrape_competitors_resilient(task_id: str, request: ScrapingRequest):
 
             # Store results
             scraping_results[task_id] = products
+            await _publish_results(task_id, products)
             progress.products_found = len(products)
             progress.status = ScrapingStatus.COMPLETED
-            progress.completed_at = datetime.now()
+            progress.completed_at = time.time()
 
     except Exception as e:
         progress.status = ScrapingStatus.FAILED
         progress.errors.append(str(e))
-        progress.completed_at = datetime.now()
+        progress.completed_at = time.time()
+    await _publish_progress(task_id, progress)
 
 @router.post("/start-scraping")
 async def start_scraping(req: Request, background_tasks: BackgroundTasks) -> ScrapingResponse:
@@ -1379,17 +2050,18 @@ async def start_scraping(req: Request, background_tasks: BackgroundTasks) -> Scr
     except Exception:
         sr = ScrapingRequest(target_products=["Coffee Mug"], max_products_per_store=17)
 
-    task_id = f"scrape_{int(time.time())}"
+    task_id = f"scrape_{secrets.token_urlsafe(9)}"
 
     # Initialize progress tracking and mark as running immediately so UI reflects start
     scraping_tasks[task_id] = ScrapingProgress(
         status=ScrapingStatus.RUNNING,
         total_stores=len(TARGET_STORES),
-        started_at=datetime.now(),
+        started_at=time.time(),
         completed_stores=0,
         products_found=0,
         errors=[],
     )
+    await _publish_progress(task_id, scraping_tasks[task_id])
 
     # Start background task
     background_tasks.add_task(scrape_competitors_background, task_id, sr)
@@ -1412,71 +2084,98 @@ async def start_scraping_get(background_tasks: BackgroundTasks) -> ScrapingRespo
     This covers clients that accidentally call GET instead of POST or cannot send a body.
     """
     sr = ScrapingRequest(target_products=["Coffee Mug"], max_products_per_store=17)
-    task_id = f"scrape_{int(time.time())}"
+    task_id = f"scrape_{secrets.token_urlsafe(9)}"
     scraping_tasks[task_id] = ScrapingProgress(
         status=ScrapingStatus.RUNNING,
         total_stores=len(TARGET_STORES),
-        started_at=datetime.now(),
+        started_at=time.time(),
     )
+    await _publish_progress(task_id, scraping_tasks[task_id])
     background_tasks.add_task(scrape_competitors_background, task_id, sr)
     return ScrapingResponse(task_id=task_id, status=ScrapingStatus.RUNNING, message="Scraping task started successfully")
 
-# Compatibility routes for builds that call /api/routes/*
-@router.post("/api/routes/start-scraping")
-async def start_scraping_api_routes(req: Request, background_tasks: BackgroundTasks) -> ScrapingResponse:
-    return await start_scraping(req, background_tasks)
-
-@router.get("/api/routes/start-scraping")
-async def start_scraping_api_routes_get(background_tasks: BackgroundTasks) -> ScrapingResponse:
-    return await start_scraping_get(background_tasks)
-
 @router.get("/scraping-progress/{task_id}")
 async def get_scraping_progress(task_id: str) -> ScrapingProgress:
     """Get scraping progress for a task"""
-    return scraping_tasks.get(task_id, ScrapingProgress(status=ScrapingStatus.FAILED))
+    if task_id not in scraping_tasks:
+        blob = await _read_published(f"scrape:{task_id}")
+        if blob is not None:
+            return Response(content=blob, media_type="application/json")
+    # Serialized by pydantic-core straight to bytes, skipping FastAPI's dict/jsonable_encoder pass
+    progress = scraping_tasks.get(task_id) or ScrapingProgress(status=ScrapingStatus.FAILED)
+    return Response(content=progress.model_dump_json(), media_type="application/json")
+
+def _etag_json_response(request: Request, body: bytes) -> Response:
+    """JSON response tagged with a content hash; a poll that already holds this body gets a bodyless 304"""
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=5"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.get("/scraping-results/{task_id}")
-async def get_scraping_results(task_id: str) -> List[ScrapedProduct]:
+async def get_scraping_results(task_id: str, request: Request) -> List[ScrapedProduct]:
     """Get scraping results for a completed task"""
-    return scraping_results.get(task_id, [])
+    if task_id not in scraping_results:
+        blob = await _read_published(f"scrape:{task_id}:results")
+        if blob is not None:
+            return _etag_json_response(request, blob)
+    # dump_json encodes the records in Rust in one pass; no model validation or intermediate dicts
+    return _etag_json_response(request, _PRODUCTS_ADAPTER.dump_json(scraping_results.get(task_id, [])))
+
+
+@router.get("/scraping-results/{task_id}/stream")
+async def stream_scraping_results(task_id: str) -> StreamingResponse:
+    """Stream scraping results as NDJSON, one product per line, without building the whole payload"""
+    products = scraping_results.get(task_id)
+    if products is None:
+        blob = await _read_published(f"scrape:{task_id}:results")
+        if blob is not None:
+            products = _PRODUCTS_ADAPTER.validate_json(blob)
+
+    def lines():
+        for p in products or []:
+            yield _PRODUCT_ADAPTER.dump_json(p) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+_RUN_CSV_COLUMNS = (
+    "store_name", "product_id", "title", "price", "currency", "brand", "description", "image_url",
+    "product_url", "in_stock", "scraped_at", "match_score", "match_confidence", "match_reasoning",
+)
+_run_csv_values = itemgetter(*_RUN_CSV_COLUMNS)
+# Header line pre-encoded once, in csv.writer's default dialect (names need no quoting)
+_RUN_CSV_HEADER = (",".join(_RUN_CSV_COLUMNS) + "\r\n").encode("utf-8")
+# Rows handed to csv.writer per writerows call; each batch is flushed to the client as one chunk
+_RUN_CSV_BATCH = 1000
 
 
 @router.get("/runs/{task_id}/export.csv")
 async def export_run_csv(task_id: str):
     """Export all rows for a run from Google Sheets history as CSV."""
-    import csv
-    import io
-    from app.libs.database import get_run_rows
-
-    rows = await get_run_rows(task_id)
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        "store_name","product_id","title","price","currency","brand","description","image_url",
-        "product_url","in_stock","scraped_at","match_score","match_confidence","match_reasoning"
-    ])
-    for r in rows:
-        writer.writerow([
-            r.get("store_name",""), r.get("product_id",""), r.get("title",""), r.get("price",""), r.get("currency",""), r.get("brand",""),
-            r.get("description",""), r.get("image_url",""), r.get("product_url",""), r.get("in_stock",""), r.get("scraped_at",""),
-            r.get("match_score",""), r.get("match_confidence",""), r.get("match_reasoning","")
-        ])
-    output.seek(0)
-    return StreamingResponse(output, media_type="text/csv", headers={"Content-Disposition": f"attachment; filename={task_id}.csv"})
-
-# Compatibility for /api/routes/* forms
-@router.get("/api/routes/scraping-progress/{task_id}")
-async def get_scraping_progress_api_routes(task_id: str) -> ScrapingProgress:
-    return await get_scraping_progress(task_id)
-
-@router.get("/api/routes/scraping-results/{task_id}")
-async def get_scraping_results_api_routes(task_id: str) -> List[ScrapedProduct]:
-    return await get_scraping_results(task_id)
+    from app.libs.database import get_run_rows_iter
+
+    async def chunks():
+        # Rows are pulled from storage in batches and encoded into one reusable buffer per batch
+        output = io.StringIO()
+        writer = csv.writer(output)
+        yield _RUN_CSV_HEADER
+        async for rows in get_run_rows_iter(task_id):
+            # Storage rows carry every column, so an itemgetter feeds writerows without per-field .get calls
+            for i in range(0, len(rows), _RUN_CSV_BATCH):
+                writer.writerows(map(_run_csv_values, rows[i:i + _RUN_CSV_BATCH]))
+                # Hand Starlette bytes so the chunk goes to the socket as-is
+                yield output.getvalue().encode("utf-8")
+                output.seek(0)
+                output.truncate(0)
+
+    return StreamingResponse(chunks(), media_type="text/csv", headers={"Content-Disposition": f"attachment; filename={task_id}.csv"})
 
 
 @router.get("/load-target-products")
-async def load_target_products() -> Dict[str, Any]:
+async def load_target_products(request: Request) -> Dict[str, Any]:
     """Read the catalog CSV and prepare canonical scraping terms and slot assignments.
 
     - Reads `Dzukou_Pricing_Overview_With_Names - Copy.csv` from repo root
@@ -1485,10 +2184,10 @@ async def load_target_products() -> Dict[str, Any]:
     - Exports a categorized CSV to `product_data/catalog_categorized.csv`
     - Returns a de-duplicated list of canonical search terms
     """
-    items = _read_catalog_csv()
+    items = await _run_csv(_read_catalog_csv)
     # Export categorized snapshot for transparency
     try:
-        path = _export_catalog_assignment(items)
+        path = await _run_csv(_export_catalog_assignment, items)
         print(f"Catalog categorized CSV exported to {path}")
     except Exception as e:
         print(f"Failed to export catalog categorization: {e}")
@@ -1502,7 +2201,8 @@ async def load_target_products() -> Dict[str, Any]:
         if term not in seen:
             seen.add(term)
             terms.append(term)
-    return {"targets": terms, "count": len(terms)}
+    body = json.dumps({"targets": terms, "count": len(terms)}, ensure_ascii=False, separators=(",", ":"))
+    return _etag_json_response(request, body.encode())
 
 
 @router.get("/export-catalog-csvs")
@@ -1514,13 +2214,27 @@ async def export_catalog_csvs() -> Dict[str, Any]:
     - product_data/catalog_by_slot/<slot>.csv (one per slot)
     - product_data/catalog_by_term/<term>.csv (one per canonical term)
     """
-    items = _read_catalog_csv()
-    assignment_path = _export_catalog_assignment(items)
-    by_slot = _export_catalog_per_slot(items)
-    by_term = _export_catalog_per_term(items)
+    items = await _run_csv(_read_catalog_csv)
+    assignment_path = await _run_csv(_export_catalog_assignment, items)
+    by_slot, by_term = await asyncio.gather(
+        _run_csv(_export_catalog_per_slot, items),
+        _run_csv(_export_catalog_per_term, items),
+    )
 
     return {
         "categorized_csv": str(assignment_path),
-        "by_slot": {k: str(v) for k, v in by_slot.items()},
-        "by_term": {k: str(v) for k, v in by_term.items()},
+        "by_slot": by_slot,
+        "by_term": by_term,
     }
+
+
+@router.get("/export-catalog-csvs.zip")
+async def export_catalog_csvs_zip() -> Response:
+    """Same per-slot/per-term CSVs as /export-catalog-csvs, delivered as one zip download."""
+    items = await _run_csv(_read_catalog_csv)
+    body = await _run_csv(_build_catalog_zip, items)
+    return Response(
+        content=body,
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=catalog_csvs.zip"},
+    )
@@ -1,26 +1,37 @@
 from fastapi import APIRouter, HTTPException
-from app.libs.database import _get_gspread_client, _open_spreadsheet, _get_storage_backend, _sqlite_connect, _sqlite_ensure_schema
-from app.libs.database import _sheetdb_base  # type: ignore
-import requests
+from app.libs.database import _get_gspread_client, _open_spreadsheet, _get_storage_backend, _sqlite_shared
+from app.libs.database import _sheetdb_base, _sheetdb_http  # type: ignore
+import time
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+# Successful /sheets probes are reused for this long, so frequent health checks don't spend Sheets API quota
+_SHEETS_PROBE_TTL = 30.0
+_sheets_probe: tuple[float, dict] | None = None
+
 
 @router.get("/sheets")
 def sheets_healthcheck():
     """Verify Google Sheets connectivity and access.
 
-    Returns spreadsheet title and worksheet titles on success.
+    Returns spreadsheet title and worksheet titles on success (cached for _SHEETS_PROBE_TTL seconds).
     """
+    global _sheets_probe
+    if _sheets_probe is not None and time.monotonic() < _sheets_probe[0]:
+        return _sheets_probe[1]
     try:
         client = _get_gspread_client()
         ss = _open_spreadsheet(client)
-        ws_titles = [ws.title for ws in ss.worksheets()]
-        return {
+        # Only the sheet titles, not the full worksheet properties
+        meta = ss.fetch_sheet_metadata({"fields": "sheets.properties.title"})
+        ws_titles = [sheet["properties"]["title"] for sheet in meta.get("sheets", [])]
+        payload = {
             "status": "ok",
             "spreadsheet_title": ss.title,
             "worksheets": ws_titles,
         }
+        _sheets_probe = (time.monotonic() + _SHEETS_PROBE_TTL, payload)
+        return payload
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Sheets connection failed: {e}")
 
@@ -37,32 +48,25 @@ def storage_healthcheck():
     backend = _get_storage_backend()
     try:
         if backend == "postgres":
-            import psycopg2  # type: ignore
-            from app.libs.database import _pg_connect, _pg_ensure_schema  # type: ignore
-            conn = _pg_connect()
-            try:
-                _pg_ensure_schema(conn)
+            from app.libs.database import _pg_pooled  # type: ignore
+            with _pg_pooled() as conn:
                 cur = conn.cursor()
-                cur.execute("SELECT COUNT(*) FROM scraping_runs")
+                # Planner estimate (O(1)); -1 until the table is first analyzed, then count exactly
+                cur.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = 'scraping_runs'::regclass")
                 runs = cur.fetchone()[0]
+                if runs < 0:
+                    cur.execute("SELECT COUNT(*) FROM scraping_runs")
+                    runs = cur.fetchone()[0]
                 return {"status": "ok", "backend": backend, "runs": runs}
-            finally:
-                conn.close()
         elif backend == "sqlite":
-            conn = _sqlite_connect()
-            try:
-                _sqlite_ensure_schema(conn)
-                cur = conn.cursor()
-                cur.execute("SELECT COUNT(*) FROM scraping_runs")
-                runs = cur.fetchone()[0]
+            with _sqlite_shared() as conn:
+                runs = conn.execute("SELECT COUNT(*) FROM scraping_runs").fetchone()[0]
                 return {"status": "ok", "backend": backend, "runs": runs}
-            finally:
-                conn.close()
         elif backend == "airtable":
             return {"status": "ok", "backend": backend}
         elif backend == "sheetdb":
             base, headers = _sheetdb_base()
-            r = requests.get(base, headers=headers, params={"limit": 1}, timeout=10)
+            r = _sheetdb_http.get(base, headers=headers, params={"limit": 1}, timeout=10)
             detail = r.text
             try:
                 detail = r.json()
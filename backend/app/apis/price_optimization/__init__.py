@@ -3,11 +3,16 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 import asyncio
+import copy
+import hashlib
 import math
 import json
+import time
+from collections import OrderedDict
 from datetime import datetime
 import os
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 # Databutton is optional in local/dev; avoid hard dependency on project id
 try:  # pragma: no cover - optional dependency in local dev
@@ -31,8 +36,15 @@ def _resolve_openai_api_key() -> str | None:
 
 _OPENAI_API_KEY = _resolve_openai_api_key()
 
-# Create client only if we have a key; downstream calls will gracefully fallback on failure
-client = OpenAI(api_key=_OPENAI_API_KEY) if _OPENAI_API_KEY else None  # type: ignore[assignment]
+# Create client only if we have a key; downstream calls will gracefully fallback on failure.
+# Async so LLM round-trips never block the event loop; concurrent batch calls share one pool.
+client = AsyncOpenAI(
+    api_key=_OPENAI_API_KEY,
+    max_retries=2,
+    http_client=DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=64)
+    ),
+) if _OPENAI_API_KEY else None  # type: ignore[assignment]
 
 # Pydantic Models
 class ProductInput(BaseModel):
@@ -92,6 +104,59 @@ class BatchOptimizationResponse(BaseModel):
     summary: Dict[str, Any]
     optimization_timestamp: str
     
+# Max products optimized at once in a batch (each issues two OpenAI calls)
+BATCH_CONCURRENCY = 10
+
+
+class _TTLCache(OrderedDict):
+    """Bounded LRU whose entries expire ``ttl`` seconds after they were stored."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+    def lookup(self, key: str):
+        entry = super().get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self[key]
+            return None
+        self.move_to_end(key)
+        return value
+
+    def store(self, key: str, value) -> None:
+        self[key] = (time.monotonic(), value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+# Identical inputs give the same answer for an hour without re-paying the LLM round-trips.
+# Analyses are cached separately so a constraints-only change still skips the first call.
+_recommendation_cache = _TTLCache(maxsize=10_000, ttl=3600)
+_analysis_cache = _TTLCache(maxsize=10_000, ttl=3600)
+
+
+def _cache_key(data: str) -> str:
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+# Scenario price points relative to the recommended price
+_SCENARIO_MULTIPLIERS = (
+    ("conservative", 0.95),  # 5% below recommended
+    ("recommended", 1.0),    # Recommended price
+    ("aggressive", 1.05),    # 5% above recommended
+)
+
+# Competitor price percentile targeted by each positioning strategy
+_TARGET_PERCENTILE = {
+    "aggressive": 0.3,   # Target 30th percentile (lower prices)
+    "competitive": 0.6,  # Target 60th percentile (slightly above median)
+    "premium": 0.8,      # Target 80th percentile (higher prices)
+}
+
 # Category-specific demand elasticity priors
 CATEGORY_ELASTICITY = {
     "sunglasses": -1.2,  # Somewhat elastic - fashion/luxury item
@@ -136,26 +201,13 @@ def calculate_demand_elasticity(product: ProductInput, competitors: List[Competi
         
     return base_elasticity
 
-async def get_llm_demand_analysis(product: ProductInput, competitors: List[CompetitorData], 
-                                market_position: str) -> Dict[str, Any]:
-    """Use LLM to analyze demand characteristics and provide insights"""
-    competitor_summary = "\n".join([
-        f"- {c.store_name}: {c.currency} {c.price:.2f} ({'in stock' if c.in_stock else 'out of stock'})"
-        for c in competitors[:5]  # Limit to top 5 for context
-    ])
-    
-    prompt = f"""As a pricing strategist, analyze the demand characteristics for this product:
-
-Product: {product.name}
-Category: {product.category or 'Unknown'}
-Current Price: {product.currency} {product.current_price:.2f}
-Unit Cost: {product.currency} {product.unit_cost:.2f}
-Current Margin: {((product.current_price - product.unit_cost) / product.current_price * 100):.1f}%
-
-Competitor Prices:
-{competitor_summary or 'No competitor data available'}
+# Fixed instructions live in the system message; the per-product data follows as a compact
+# JSON user message instead of being interpolated into the instruction text.
+_DEMAND_SYSTEM_PROMPT = """You are an expert pricing strategist. Always respond with valid JSON only.
 
-Market Position: {market_position}
+The user message is a JSON object describing one product: its name, category, currency, current price,
+unit cost, current margin, up to five competitor prices (with stock status) and its market position.
+Analyze the demand characteristics for this product.
 
 Provide a JSON response with:
 1. demand_elasticity_estimate (float between -0.5 to -2.0)
@@ -167,30 +219,128 @@ Provide a JSON response with:
 
 Return only valid JSON without markdown formatting."""
 
+# Appended after the single-product instructions so batch calls reuse them verbatim
+_DEMAND_BATCH_SUFFIX = """
+
+Batch mode: the user message may instead be a JSON object {"products": [...]} holding several such
+product objects, each with an "id". Then respond with a JSON object {"analyses": [...]} containing one
+analysis object per product, in the same order, each carrying the product's "id" plus the six fields above."""
+
+# Products per batched analysis call; keeps each response well inside the output token limit
+ANALYSIS_BATCH_SIZE = 20
+
+_RATIONALE_SYSTEM_PROMPT = """You are a pricing expert providing clear, actionable rationale. Be concise and confident.
+
+The user message is a JSON object with a product's current and recommended price, the price change,
+the market analysis (competitive position, brand strength 0-1, market saturation, positioning) and
+the pricing constraints that were applied.
+
+Provide a 2-3 sentence rationale explaining:
+1. Why this price is optimal
+2. Key market factors considered
+3. Expected business impact
+
+Be specific about profit/demand implications and sound confident but data-driven."""
+
+
+# Basic analysis used when the LLM call fails
+_FALLBACK_ANALYSIS: Dict[str, Any] = {
+    "demand_elasticity_estimate": -1.0,
+    "brand_strength_score": 0.5,
+    "market_saturation_level": "medium",
+    "price_sensitivity_factors": ["competitor pricing", "product quality"],
+    "seasonal_considerations": "No specific seasonal factors identified",
+    "recommended_positioning": "value"
+}
+
+def _demand_payload(product: ProductInput, competitors: List[CompetitorData],
+                    market_position: str) -> Dict[str, Any]:
+    """Per-product facts for the demand prompt; the instructions live in the static system prompt"""
+    return {
+        "product": product.name,
+        "category": product.category or "Unknown",
+        "currency": product.currency,
+        "current_price": round(product.current_price, 2),
+        "unit_cost": round(product.unit_cost, 2),
+        "current_margin_percent": round((product.current_price - product.unit_cost) / product.current_price * 100, 1),
+        "competitors": [
+            {"store": c.store_name, "currency": c.currency, "price": round(c.price, 2), "in_stock": c.in_stock}
+            for c in competitors[:5]  # Limit to top 5 for context
+        ],
+        "market_position": market_position,
+    }
+
+def _analysis_key(payload: Dict[str, Any]) -> str:
+    return _cache_key(json.dumps(payload, sort_keys=True))
+
+async def get_llm_demand_analysis(product: ProductInput, competitors: List[CompetitorData], 
+                                market_position: str) -> Dict[str, Any]:
+    """Use LLM to analyze demand characteristics and provide insights"""
+    payload = _demand_payload(product, competitors, market_position)
+    key = _analysis_key(payload)
+    cached = _analysis_cache.lookup(key)
+    if cached is not None:
+        return dict(cached)
+
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
-                {"role": "system", "content": "You are an expert pricing strategist. Always respond with valid JSON only."},
-                {"role": "user", "content": prompt}
+                {"role": "system", "content": _DEMAND_SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps(payload)}
             ],
             temperature=0.3
         )
         
         analysis = json.loads(response.choices[0].message.content)
-        return analysis
+        # Only real LLM answers are cached; the fallback below is retried next time
+        _analysis_cache.store(key, analysis)
+        return dict(analysis)
         
     except Exception as e:
         print(f"LLM analysis failed: {e}")
         # Fallback to basic analysis
-        return {
-            "demand_elasticity_estimate": -1.0,
-            "brand_strength_score": 0.5,
-            "market_saturation_level": "medium",
-            "price_sensitivity_factors": ["competitor pricing", "product quality"],
-            "seasonal_considerations": "No specific seasonal factors identified",
-            "recommended_positioning": "value"
-        }
+        return copy.deepcopy(_FALLBACK_ANALYSIS)
+
+async def get_llm_demand_analysis_batch(products: List[ProductInput],
+                                       competitors_map: Dict[str, List[CompetitorData]],
+                                       positions: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """Analyze several products in one LLM call.
+
+    Each returned analysis is also stored in the analysis cache, so a following
+    get_llm_demand_analysis for the same inputs is answered without another call.
+    Products the model skipped (or the whole batch, on failure) come back as None.
+    """
+    payloads = [
+        _demand_payload(p, competitors_map.get(p.id, []), position)
+        for p, position in zip(products, positions)
+    ]
+    try:
+        response = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": _DEMAND_SYSTEM_PROMPT + _DEMAND_BATCH_SUFFIX},
+                {"role": "user", "content": json.dumps({
+                    "products": [{"id": str(i), **payload} for i, payload in enumerate(payloads)]
+                })}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.3
+        )
+        entries = json.loads(response.choices[0].message.content).get("analyses", [])
+    except Exception as e:
+        print(f"Batch LLM analysis failed: {e}")
+        return [None] * len(payloads)
+
+    by_id = {str(entry.get("id")): entry for entry in entries if isinstance(entry, dict)}
+    analyses: List[Optional[Dict[str, Any]]] = []
+    for i, payload in enumerate(payloads):
+        entry = by_id.get(str(i))
+        if entry is not None:
+            entry = {k: v for k, v in entry.items() if k != "id"}
+            _analysis_cache.store(_analysis_key(payload), entry)
+        analyses.append(entry)
+    return analyses
 
 def calculate_expected_demand_change(price_change_percent: float, elasticity: float) -> float:
     """Calculate expected demand change using price elasticity"""
@@ -202,13 +352,14 @@ def assess_competitive_position(current_price: float, competitors: List[Competit
     if not competitors:
         return "no_competition"
         
-    competitor_prices = [c.price for c in competitors if c.price > 0]
+    # One sort gives min, max and the (upper) median
+    competitor_prices = sorted(c.price for c in competitors if c.price > 0)
     if not competitor_prices:
         return "no_pricing_data"
         
-    min_price = min(competitor_prices)
-    max_price = max(competitor_prices)
-    median_price = sorted(competitor_prices)[len(competitor_prices) // 2]
+    min_price = competitor_prices[0]
+    max_price = competitor_prices[-1]
+    median_price = competitor_prices[len(competitor_prices) // 2]
     
     if current_price < min_price * 0.9:
         return "significantly_underpriced"
@@ -223,44 +374,39 @@ def assess_competitive_position(current_price: float, competitors: List[Competit
 
 async def generate_pricing_rationale(product: ProductInput, recommended_price: float, 
                                    analysis: Dict[str, Any], competitive_position: str,
-                                   constraints: OptimizationConstraints) -> str:
-    """Generate LLM-based rationale for price recommendation"""
+                                   constraints: OptimizationConstraints) -> Optional[str]:
+    """Generate LLM-based rationale for price recommendation; None if the call failed"""
     
     price_change = recommended_price - product.current_price
     price_change_pct = (price_change / product.current_price) * 100
     
-    prompt = f"""As a pricing expert, provide a clear, concise rationale for this price recommendation:
-
-Product: {product.name}
-Current Price: {product.currency} {product.current_price:.2f}
-Recommended Price: {product.currency} {recommended_price:.2f}
-Price Change: {price_change:+.2f} ({price_change_pct:+.1f}%)
-
-Market Analysis:
-- Competitive Position: {competitive_position}
-- Brand Strength: {analysis.get('brand_strength_score', 0.5):.1f}/1.0
-- Market Saturation: {analysis.get('market_saturation_level', 'medium')}
-- Positioning: {analysis.get('recommended_positioning', 'value')}
-
-Constraints Applied:
-- Min Margin: {constraints.min_margin_percent}%
-- Max Increase: {constraints.max_price_increase_percent}%
-- Psychological Pricing: {constraints.psychological_pricing}
-- Strategy: {constraints.competitive_positioning}
-
-Provide a 2-3 sentence rationale explaining:
-1. Why this price is optimal
-2. Key market factors considered
-3. Expected business impact
-
-Be specific about profit/demand implications and sound confident but data-driven."""
+    payload = {
+        "product": product.name,
+        "currency": product.currency,
+        "current_price": round(product.current_price, 2),
+        "recommended_price": round(recommended_price, 2),
+        "price_change": round(price_change, 2),
+        "price_change_percent": round(price_change_pct, 1),
+        "market_analysis": {
+            "competitive_position": competitive_position,
+            "brand_strength": round(analysis.get('brand_strength_score', 0.5), 1),
+            "market_saturation": analysis.get('market_saturation_level', 'medium'),
+            "positioning": analysis.get('recommended_positioning', 'value'),
+        },
+        "constraints": {
+            "min_margin_percent": constraints.min_margin_percent,
+            "max_increase_percent": constraints.max_price_increase_percent,
+            "psychological_pricing": constraints.psychological_pricing,
+            "strategy": constraints.competitive_positioning,
+        },
+    }
 
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
-                {"role": "system", "content": "You are a pricing expert providing clear, actionable rationale. Be concise and confident."},
-                {"role": "user", "content": prompt}
+                {"role": "system", "content": _RATIONALE_SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps(payload)}
             ],
             temperature=0.2
         )
@@ -269,7 +415,7 @@ Be specific about profit/demand implications and sound confident but data-driven
         
     except Exception as e:
         print(f"Rationale generation failed: {e}")
-        return f"Recommended price increase of {price_change_pct:.1f}% based on competitive analysis and profit optimization. This adjustment balances market positioning with margin improvement while considering demand elasticity."
+        return None
 
 def optimize_single_product_price(product: ProductInput, competitors: List[CompetitorData],
                                 constraints: OptimizationConstraints, 
@@ -278,31 +424,23 @@ def optimize_single_product_price(product: ProductInput, competitors: List[Compe
     
     constraint_flags = []
     
-    # Get market data
-    competitor_prices = [c.price for c in competitors if c.price > 0]
-    
-    # Calculate elasticity
-    base_elasticity = llm_analysis.get('demand_elasticity_estimate', -1.0)
-    elasticity = base_elasticity * constraints.demand_sensitivity
+    # Get market data (elasticity does not move the price here; it only feeds the metrics).
+    # Sorted once: bounds and the target percentile are read straight off the list.
+    competitor_prices = sorted(c.price for c in competitors if c.price > 0)
     
     # Market bounds
     if competitor_prices:
-        market_min = min(competitor_prices) * 0.8  # Can be 20% below market min
-        market_max = max(competitor_prices) * 1.3  # Can be 30% above market max
+        market_min = competitor_prices[0] * 0.8  # Can be 20% below market min
+        market_max = competitor_prices[-1] * 1.3  # Can be 30% above market max
     else:
         market_min = product.current_price * 0.5
         market_max = product.current_price * 2.0
     
-    # Price optimization based on strategy
-    if constraints.competitive_positioning == "aggressive":
-        target_percentile = 0.3  # Target 30th percentile (lower prices)
-    elif constraints.competitive_positioning == "premium":
-        target_percentile = 0.8  # Target 80th percentile (higher prices)
-    else:  # competitive
-        target_percentile = 0.6  # Target 60th percentile (slightly above median)
+    # Price optimization based on strategy; anything unrecognised is treated as "competitive"
+    target_percentile = _TARGET_PERCENTILE.get(constraints.competitive_positioning, 0.6)
     
     if competitor_prices:
-        target_price = sorted(competitor_prices)[int(len(competitor_prices) * target_percentile)]
+        target_price = competitor_prices[int(len(competitor_prices) * target_percentile)]
     else:
         target_price = product.current_price * 1.1  # 10% increase if no competition
     
@@ -345,40 +483,35 @@ def calculate_scenario_analysis(product: ProductInput, recommended_price: float,
                               elasticity: float, competitors: List[CompetitorData]) -> Dict[str, Any]:
     """Calculate different pricing scenarios"""
     current_price = product.current_price
-    base_margin = current_price - product.unit_cost
+    unit_cost = product.unit_cost
+    base_margin = current_price - unit_cost
+    
+    # Assume base demand of 100 units for relative comparison; baselines are loop-invariant
+    base_units = 100
+    base_revenue = current_price * base_units
+    base_profit = base_margin * base_units
     
     scenarios = {}
     
     # Test different price points
-    for scenario_name, price_multiplier in [
-        ("conservative", 0.95),  # 5% below recommended
-        ("recommended", 1.0),    # Recommended price
-        ("aggressive", 1.05)     # 5% above recommended
-    ]:
+    for scenario_name, price_multiplier in _SCENARIO_MULTIPLIERS:
         scenario_price = recommended_price * price_multiplier
         price_change_pct = ((scenario_price - current_price) / current_price) * 100
         
         # Calculate demand impact
-        demand_change_pct = calculate_expected_demand_change(price_change_pct, elasticity)
-        
-        # Calculate financial impact
-        new_margin = scenario_price - product.unit_cost
-        margin_change = new_margin - base_margin
-        
-        # Assume base demand of 100 units for relative comparison
-        base_units = 100
+        demand_change_pct = elasticity * price_change_pct
         new_units = base_units * (1 + demand_change_pct / 100)
         
-        revenue_change = (scenario_price * new_units) - (current_price * base_units)
-        profit_change = (new_margin * new_units) - (base_margin * base_units)
+        # Calculate financial impact
+        new_margin = scenario_price - unit_cost
         
         scenarios[scenario_name] = {
             "price": round(scenario_price, 2),
             "price_change_percent": round(price_change_pct, 1),
             "demand_change_percent": round(demand_change_pct, 1),
             "expected_units": round(new_units, 0),
-            "revenue_change": round(revenue_change, 2),
-            "profit_change": round(profit_change, 2),
+            "revenue_change": round(scenario_price * new_units - base_revenue, 2),
+            "profit_change": round(new_margin * new_units - base_profit, 2),
             "margin_percent": round((new_margin / scenario_price) * 100, 1)
         }
     
@@ -427,6 +560,15 @@ def calculate_confidence_score(product: ProductInput, competitors: List[Competit
 async def optimize_price(request: PriceOptimizationRequest) -> PriceRecommendation:
     """Optimize price for a single product using AI and competitive analysis"""
     
+    # Competitor order does not affect the result, so it must not affect the key either
+    canonical = request.model_copy(update={"competitors": sorted(
+        request.competitors, key=lambda c: (c.store_name, c.product_url, c.price)
+    )})
+    request_key = _cache_key(canonical.model_dump_json())
+    cached = _recommendation_cache.lookup(request_key)
+    if cached is not None:
+        return cached.model_copy(deep=True)
+    
     try:
         product = request.product
         competitors = request.competitors
@@ -441,50 +583,47 @@ async def optimize_price(request: PriceOptimizationRequest) -> PriceRecommendati
             product, competitors, constraints, llm_analysis
         )
         
-        # Step 3: Calculate metrics
-        price_change = recommended_price - product.current_price
-        price_change_percent = (price_change / product.current_price) * 100
-        
-        elasticity = llm_analysis.get('demand_elasticity_estimate', -1.0) * constraints.demand_sensitivity
-        expected_demand_change_percent = calculate_expected_demand_change(price_change_percent, elasticity)
-        
-        # Financial impact calculations
-        current_margin = product.current_price - product.unit_cost
-        new_margin = recommended_price - product.unit_cost
-        margin_change = new_margin - current_margin
-        
-        # Assume base demand for relative calculations
-        base_demand = 100
-        new_demand = base_demand * (1 + expected_demand_change_percent / 100)
+        # The rationale only needs the analysis and the chosen price: request it now and
+        # compute the metrics below while the LLM call is in flight
+        rationale_task = asyncio.create_task(generate_pricing_rationale(
+            product, recommended_price, llm_analysis, competitive_position, constraints
+        ))
         
-        expected_profit_change = (new_margin * new_demand) - (current_margin * base_demand)
-        expected_revenue_change = (recommended_price * new_demand) - (product.current_price * base_demand)
+        try:
+            # Step 3: Scenario analysis; its "recommended" row is exactly the headline metrics
+            price_change = recommended_price - product.current_price
+            elasticity = llm_analysis.get('demand_elasticity_estimate', -1.0) * constraints.demand_sensitivity
+            scenario_analysis = calculate_scenario_analysis(
+                product, recommended_price, elasticity, competitors
+            )
+            recommended = scenario_analysis["recommended"]
         
-        # Step 4: Confidence and risk assessment
-        confidence_score, risk_level = calculate_confidence_score(
-            product, competitors, llm_analysis, constraint_flags
-        )
+            # Step 4: Confidence and risk assessment
+            confidence_score, risk_level = calculate_confidence_score(
+                product, competitors, llm_analysis, constraint_flags
+            )
         
-        # Step 5: Scenario analysis
-        scenario_analysis = calculate_scenario_analysis(
-            product, recommended_price, elasticity, competitors
-        )
+            # Step 5: Collect rationale
+            llm_rationale = await rationale_task
+        finally:
+            # A failure above must not leave the OpenAI call running unawaited
+            if not rationale_task.done():
+                rationale_task.cancel()
         
-        # Step 6: Generate rationale
-        rationale = await generate_pricing_rationale(
-            product, recommended_price, llm_analysis, competitive_position, constraints
-        )
+        rationale = llm_rationale
+        if rationale is None:
+            rationale = f"Recommended price increase of {recommended['price_change_percent']:.1f}% based on competitive analysis and profit optimization. This adjustment balances market positioning with margin improvement while considering demand elasticity."
         
-        return PriceRecommendation(
+        recommendation = PriceRecommendation(
             product_id=product.id,
             current_price=product.current_price,
             recommended_price=round(recommended_price, 2),
             currency=product.currency,
             price_change=round(price_change, 2),
-            price_change_percent=round(price_change_percent, 1),
-            expected_demand_change_percent=round(expected_demand_change_percent, 1),
-            expected_profit_change=round(expected_profit_change, 2),
-            expected_revenue_change=round(expected_revenue_change, 2),
+            price_change_percent=recommended["price_change_percent"],
+            expected_demand_change_percent=recommended["demand_change_percent"],
+            expected_profit_change=recommended["profit_change"],
+            expected_revenue_change=recommended["revenue_change"],
             confidence_score=round(confidence_score, 2),
             risk_level=risk_level,
             rationale=rationale,
@@ -493,37 +632,80 @@ async def optimize_price(request: PriceOptimizationRequest) -> PriceRecommendati
             constraint_flags=constraint_flags,
             scenario_analysis=scenario_analysis
         )
+        # Recommendations built on either LLM fallback are not cached
+        if llm_analysis != _FALLBACK_ANALYSIS and llm_rationale is not None:
+            _recommendation_cache.store(request_key, recommendation.model_copy(deep=True))
+        return recommendation
         
     except Exception as e:
         print(f"Price optimization error: {e}")
         raise HTTPException(status_code=500, detail=f"Price optimization failed: {str(e)}") from e
 
+async def _prefetch_demand_analyses(request: BatchOptimizationRequest) -> None:
+    if client is None:
+        return
+    pending: Dict[str, tuple[ProductInput, str]] = {}
+    for product in request.products:
+        if product.current_price <= 0:
+            continue  # optimize_price rejects these anyway
+        competitors = request.competitor_data.get(product.id, [])
+        position = assess_competitive_position(product.current_price, competitors)
+        key = _analysis_key(_demand_payload(product, competitors, position))
+        if key not in pending and _analysis_cache.lookup(key) is None:
+            pending[key] = (product, position)
+    if not pending:
+        return
+    todo = list(pending.values())
+    chunks = [todo[i:i + ANALYSIS_BATCH_SIZE] for i in range(0, len(todo), ANALYSIS_BATCH_SIZE)]
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def _run(chunk):
+        async with semaphore:
+            await get_llm_demand_analysis_batch(
+                [p for p, _ in chunk], request.competitor_data, [pos for _, pos in chunk]
+            )
+
+    await asyncio.gather(*[_run(chunk) for chunk in chunks])
+
 @router.post("/optimize-batch")
 async def optimize_batch(request: BatchOptimizationRequest) -> BatchOptimizationResponse:
     """Optimize prices for multiple products in batch"""
     
     try:
-        recommendations = []
+        # Warm the analysis cache with one LLM call per ANALYSIS_BATCH_SIZE products instead of
+        # one per product; anything the batch misses falls back to the per-product call below
+        await _prefetch_demand_analyses(request)
         
-        # Process each product
-        for product in request.products:
-            competitors = request.competitor_data.get(product.id, [])
-            
-            optimization_request = PriceOptimizationRequest(
-                product=product,
-                competitors=competitors,
-                constraints=request.global_constraints
-            )
-            
-            recommendation = await optimize_price(optimization_request)
-            recommendations.append(recommendation)
+        # Products are independent and LLM-bound, so run them concurrently (bounded for rate limits)
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def _run(product: ProductInput) -> PriceRecommendation:
+            async with semaphore:
+                return await optimize_price(PriceOptimizationRequest(
+                    product=product,
+                    competitors=request.competitor_data.get(product.id, []),
+                    constraints=request.global_constraints
+                ))
+
+        results = await asyncio.gather(*[_run(p) for p in request.products], return_exceptions=True)
+
+        # One failing product no longer sinks the batch; failures are reported in the summary
+        recommendations = []
+        failed_products = []
+        for product, result in zip(request.products, results):
+            if isinstance(result, BaseException):
+                print(f"Batch optimization failed for {product.id}: {result}")
+                failed_products.append(product.id)
+            else:
+                recommendations.append(result)
         
         # Calculate summary statistics
         total_current_revenue = sum(r.current_price for r in recommendations)
         total_recommended_revenue = sum(r.recommended_price for r in recommendations)
         total_profit_change = sum(r.expected_profit_change for r in recommendations)
         
-        avg_price_increase = sum(r.price_change_percent for r in recommendations) / len(recommendations)
+        count = max(len(recommendations), 1)
+        avg_price_increase = sum(r.price_change_percent for r in recommendations) / count
         high_confidence_count = sum(1 for r in recommendations if r.confidence_score > 0.8)
         
         summary = {
@@ -534,7 +716,8 @@ async def optimize_batch(request: BatchOptimizationRequest) -> BatchOptimization
             "total_revenue_uplift": round(total_recommended_revenue - total_current_revenue, 2),
             "total_profit_change": round(total_profit_change, 2),
             "high_confidence_recommendations": high_confidence_count,
-            "confidence_rate": round(high_confidence_count / len(recommendations) * 100, 1)
+            "confidence_rate": round(high_confidence_count / count * 100, 1),
+            "failed_products": failed_products
         }
         
         return BatchOptimizationResponse(
@@ -1,9 +1,15 @@
 import os
 import json
 import base64
+import csv
+import io
 import sqlite3
 import asyncio
-from typing import Iterable, TYPE_CHECKING, List, Dict, Any, Tuple
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, Iterator, TYPE_CHECKING, List, Dict, Any, Tuple
 from pathlib import Path
 from datetime import datetime
 
@@ -12,9 +18,10 @@ from dotenv import load_dotenv, find_dotenv
 import gspread
 from google.oauth2.service_account import Credentials
 import requests
+from requests.adapters import HTTPAdapter
 
 if TYPE_CHECKING:  # pragma: no cover
-    from app.apis.competitor_scraping import ScrapedProduct
+    from app.apis.competitor_scraping import ScrapedProductRecord
 
 
 # ---- Environment loading ----
@@ -70,7 +77,25 @@ SCOPES = [
 ]
 
 
+# One authorized client per process: building it mints a service-account token (JWT signing plus a
+# token-endpoint round-trip). google-auth refreshes the token itself; the client is rebuilt well
+# inside the 1 h token lifetime anyway so credential changes in the environment get picked up.
+_GSPREAD_CLIENT_TTL = 50 * 60
+_gspread_client: gspread.Client | None = None
+_gspread_client_expires = 0.0
+_gspread_client_lock = threading.Lock()
+
+
 def _get_gspread_client() -> gspread.Client:
+    global _gspread_client, _gspread_client_expires
+    with _gspread_client_lock:
+        if _gspread_client is None or time.monotonic() >= _gspread_client_expires:
+            _gspread_client = _build_gspread_client()
+            _gspread_client_expires = time.monotonic() + _GSPREAD_CLIENT_TTL
+        return _gspread_client
+
+
+def _build_gspread_client() -> gspread.Client:
     _ensure_env_loaded()
     # Optional: OAuth user flow for a regular Google account
     oauth_credentials = os.getenv("GOOGLE_OAUTH_CREDENTIALS_FILE")
@@ -240,6 +265,11 @@ def _read_all(ws, headers: List[str]) -> List[Dict[str, Any]]:
 
 
 # ---- SheetDB helpers ----
+# One pooled session for every SheetDB call, so the TLS connection is reused across requests
+_sheetdb_http = requests.Session()
+_sheetdb_http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
 def _sheetdb_base() -> tuple[str, dict]:
     """Return base URL and headers for SheetDB.
 
@@ -264,7 +294,7 @@ def _sheetdb_insert(sheet: str, rows: List[Dict[str, Any]]):
     # If the sheet is empty (no headers), API returns an error; we surface it up.
     url = base
     params = {"sheet": sheet} if sheet else None
-    resp = requests.post(url, headers={**headers, "Content-Type": "application/json"}, json={"data": rows}, params=params, timeout=20)
+    resp = _sheetdb_http.post(url, headers={**headers, "Content-Type": "application/json"}, json={"data": rows}, params=params, timeout=20)
     if resp.status_code >= 300:
         raise RuntimeError(f"SheetDB insert failed ({resp.status_code}): {resp.text}")
     return resp.json()
@@ -281,7 +311,7 @@ def _sheetdb_select(sheet: str, query: Dict[str, Any] | None = None, limit: int
     if query:
         for k, v in query.items():
             params[f"search[{k}]"] = v
-    resp = requests.get(base, headers=headers, params=params, timeout=20)
+    resp = _sheetdb_http.get(base, headers=headers, params=params, timeout=20)
     if resp.status_code >= 300:
         raise RuntimeError(f"SheetDB select failed ({resp.status_code}): {resp.text}")
     try:
@@ -368,13 +398,12 @@ def _sqlite_ensure_schema(conn: sqlite3.Connection) -> None:
 
 
 # ---- Postgres helpers ----
-def _pg_connect():
-    import psycopg2  # type: ignore
+def _pg_dsn() -> str:
     _ensure_env_loaded()
     dsn = os.getenv("DATABASE_URL")
     if not dsn:
         raise RuntimeError("DATABASE_URL is not set")
-    return psycopg2.connect(dsn)
+    return dsn
 
 
 def _pg_ensure_schema(conn) -> None:
@@ -441,6 +470,96 @@ def _pg_ensure_schema(conn) -> None:
     conn.commit()
 
 
+# Lazily created pool shared by every Postgres read/write and the health probe; the schema is
+# ensured once when the pool is built instead of on every call
+_PG_POOL_MAX = 20
+_pg_pool = None
+_pg_pool_lock = threading.Lock()
+# ThreadedConnectionPool raises when exhausted; callers wait for a free slot instead
+_pg_pool_slots = threading.BoundedSemaphore(_PG_POOL_MAX)
+
+
+@contextmanager
+def _pg_pooled():
+    """Borrow a connection from the shared Postgres pool (schema already ensured), returning it after."""
+    global _pg_pool
+    with _pg_pool_lock:
+        if _pg_pool is None:
+            from psycopg2.pool import ThreadedConnectionPool  # type: ignore
+            pool = ThreadedConnectionPool(1, _PG_POOL_MAX, _pg_dsn())
+            conn = pool.getconn()
+            try:
+                _pg_ensure_schema(conn)
+            finally:
+                pool.putconn(conn)
+            _pg_pool = pool
+    _pg_pool_slots.acquire()
+    try:
+        conn = _pg_pool.getconn()
+        clean = False
+        try:
+            yield conn
+            clean = True
+        finally:
+            if clean:
+                # End any read transaction so the pooled connection goes back idle
+                conn.rollback()
+                _pg_pool.putconn(conn)
+            else:
+                # Error, or an export generator abandoned mid-cursor: drop the connection
+                # rather than hand out one in an unknown state
+                _pg_pool.putconn(conn, close=True)
+    finally:
+        _pg_pool_slots.release()
+
+
+def _pg_copy_upsert(cur, table: str, cols: List[str], key_cols: Tuple[str, ...],
+                    rows: Iterable[Dict[str, Any]]) -> None:
+    """Bulk upsert: COPY the rows into a temp staging table, then merge with one INSERT ... ON CONFLICT.
+
+    One statement is parsed and the tuples stream in, instead of a round-trip per row. Rows are
+    de-duplicated on the key first (last one wins, as with row-by-row upserts), since a single
+    ON CONFLICT DO UPDATE may not touch the same row twice. Runs inside the caller's transaction.
+    """
+    latest: Dict[tuple, list] = {}
+    for d in rows:
+        latest[tuple(d.get(c, "") for c in key_cols)] = [d.get(c, "") for c in cols]
+    if not latest:
+        return
+    buf = io.StringIO()
+    csv.writer(buf).writerows(latest.values())
+    buf.seek(0)
+    col_list = ", ".join(cols)
+    stage = f"_stage_{table}"
+    cur.execute(f"CREATE TEMP TABLE {stage} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+    # FORCE_NOT_NULL keeps empty fields as '' (what the row-by-row inserts stored), not NULL
+    cur.copy_expert(f"COPY {stage} ({col_list}) FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL ({col_list}))", buf)
+    cur.execute(
+        f"""
+        INSERT INTO {table} ({col_list})
+        SELECT {col_list} FROM {stage}
+        ON CONFLICT ({', '.join(key_cols)}) DO UPDATE SET
+        {', '.join(f"{c}=EXCLUDED.{c}" for c in cols if c not in key_cols)}
+        """
+    )
+
+
+# A single long-lived SQLite connection (WAL mode) for health probes, serialised by a lock
+_sqlite_probe_conn: sqlite3.Connection | None = None
+_sqlite_probe_lock = threading.Lock()
+
+
+@contextmanager
+def _sqlite_shared():
+    global _sqlite_probe_conn
+    with _sqlite_probe_lock:
+        if _sqlite_probe_conn is None:
+            conn = _sqlite_connect()
+            _sqlite_ensure_schema(conn)
+            _sqlite_probe_conn = conn
+        yield _sqlite_probe_conn
+
+
 # ---- Public API (replacing DB with Sheets) ----
 PRODUCT_HEADERS = [
     "store_name",
@@ -461,6 +580,8 @@ PRODUCT_HEADERS = [
 ]
 
 RUN_PRODUCT_HEADERS = ["run_id"] + PRODUCT_HEADERS
+# Blank template merged under partial rows ({**_EMPTY_RUN_ROW, **r}) so every column is present
+_EMPTY_RUN_ROW = dict.fromkeys(RUN_PRODUCT_HEADERS, "")
 
 RUN_HEADERS = [
     "id",
@@ -475,7 +596,7 @@ RUN_HEADERS = [
 ]
 
 
-def _product_to_dict(p: "ScrapedProduct") -> Dict[str, Any]:
+def _product_to_dict(p: "ScrapedProductRecord") -> Dict[str, Any]:
     return {
         "store_name": p.store_name,
         "product_id": p.product_id or "",
@@ -495,7 +616,7 @@ def _product_to_dict(p: "ScrapedProduct") -> Dict[str, Any]:
     }
 
 
-async def save_scraped_products(products: Iterable["ScrapedProduct"]) -> None:
+async def save_scraped_products(products: Iterable["ScrapedProductRecord"]) -> None:
     products = list(products)
     if not products:
         return
@@ -503,30 +624,12 @@ async def save_scraped_products(products: Iterable["ScrapedProduct"]) -> None:
     STORAGE_BACKEND = _get_storage_backend()
     if STORAGE_BACKEND == "postgres":
         def _sync_pg():
-            conn = _pg_connect()
-            try:
-                _pg_ensure_schema(conn)
-                cur = conn.cursor()
-                for p in products:
-                    d = _product_to_dict(p)
-                    cols = [
-                        "product_url","store_name","product_id","title","price","currency","brand",
-                        "description","image_url","in_stock","scraped_at","match_score","match_confidence",
-                        "match_reasoning","raw_data"
-                    ]
-                    vals = [d.get(c, "") for c in cols]
-                    cur.execute(
-                        f"""
-                        INSERT INTO scraped_products ({', '.join(cols)})
-                        VALUES ({', '.join(['%s']*len(cols))})
-                        ON CONFLICT (product_url) DO UPDATE SET
-                        {', '.join([f"{c}=EXCLUDED.{c}" for c in cols if c != 'product_url'])}
-                        """,
-                        vals,
-                    )
+            with _pg_pooled() as conn:
+                _pg_copy_upsert(
+                    conn.cursor(), "scraped_products", PRODUCT_HEADERS, ("product_url",),
+                    (_product_to_dict(p) for p in products),
+                )
                 conn.commit()
-            finally:
-                conn.close()
         await asyncio.to_thread(_sync_pg)
     elif STORAGE_BACKEND == "sqlite":
         def _sync_sqlite():
@@ -597,7 +700,7 @@ async def save_scraped_products(products: Iterable["ScrapedProduct"]) -> None:
         await asyncio.to_thread(_sync_sheets)
 
 
-async def save_scraped_products_for_run(products: Iterable["ScrapedProduct"], run_id: str) -> None:
+async def save_scraped_products_for_run(products: Iterable["ScrapedProductRecord"], run_id: str) -> None:
     products = list(products)
     if not products:
         return
@@ -605,46 +708,17 @@ async def save_scraped_products_for_run(products: Iterable["ScrapedProduct"], ru
     STORAGE_BACKEND = _get_storage_backend()
     if STORAGE_BACKEND == "postgres":
         def _sync_pg():
-            conn = _pg_connect()
-            try:
-                _pg_ensure_schema(conn)
+            dicts = [_product_to_dict(p) for p in products]
+            with _pg_pooled() as conn:
                 cur = conn.cursor()
                 # history upserts
-                for p in products:
-                    dprod = _product_to_dict(p)
-                    d = {"run_id": run_id, **dprod}
-                    cols = ["run_id"] + PRODUCT_HEADERS
-                    vals = [d.get(c, "") for c in cols]
-                    cur.execute(
-                        f"""
-                        INSERT INTO scraped_products_run ({', '.join(cols)})
-                        VALUES ({', '.join(['%s']*len(cols))})
-                        ON CONFLICT (run_id, product_url) DO UPDATE SET
-                        {', '.join([f"{c}=EXCLUDED.{c}" for c in cols if c not in ('run_id','product_url')])}
-                        """,
-                        vals,
-                    )
+                _pg_copy_upsert(
+                    cur, "scraped_products_run", RUN_PRODUCT_HEADERS, ("run_id", "product_url"),
+                    ({"run_id": run_id, **d} for d in dicts),
+                )
                 # latest snapshot upserts
-                for p in products:
-                    d = _product_to_dict(p)
-                    cols = [
-                        "product_url","store_name","product_id","title","price","currency","brand",
-                        "description","image_url","in_stock","scraped_at","match_score","match_confidence",
-                        "match_reasoning","raw_data"
-                    ]
-                    vals = [d.get(c, "") for c in cols]
-                    cur.execute(
-                        f"""
-                        INSERT INTO scraped_products ({', '.join(cols)})
-                        VALUES ({', '.join(['%s']*len(cols))})
-                        ON CONFLICT (product_url) DO UPDATE SET
-                        {', '.join([f"{c}=EXCLUDED.{c}" for c in cols if c != 'product_url'])}
-                        """,
-                        vals,
-                    )
+                _pg_copy_upsert(cur, "scraped_products", PRODUCT_HEADERS, ("product_url",), dicts)
                 conn.commit()
-            finally:
-                conn.close()
         await asyncio.to_thread(_sync_pg)
     elif STORAGE_BACKEND == "sqlite":
         def _sync_sqlite():
@@ -761,9 +835,7 @@ async def create_scraping_run(run_id: str, target_products: List[str], total_sto
     STORAGE_BACKEND = _get_storage_backend()
     if STORAGE_BACKEND == "postgres":
         def _sync_pg():
-            conn = _pg_connect()
-            try:
-                _pg_ensure_schema(conn)
+            with _pg_pooled() as conn:
                 cur = conn.cursor()
                 cur.execute(
                     """
@@ -784,8 +856,6 @@ async def create_scraping_run(run_id: str, target_products: List[str], total_sto
                     ),
                 )
                 conn.commit()
-            finally:
-                conn.close()
         await asyncio.to_thread(_sync_pg)
     elif STORAGE_BACKEND == "sqlite":
         def _sync_sqlite():
@@ -879,9 +949,7 @@ async def update_scraping_run(
     STORAGE_BACKEND = _get_storage_backend()
     if STORAGE_BACKEND == "postgres":
         def _sync_pg():
-            conn = _pg_connect()
-            try:
-                _pg_ensure_schema(conn)
+            with _pg_pooled() as conn:
                 cur = conn.cursor()
                 # read existing errors
                 cur.execute("SELECT errors FROM scraping_runs WHERE id=%s", (run_id,))
@@ -915,8 +983,6 @@ async def update_scraping_run(
                     ),
                 )
                 conn.commit()
-            finally:
-                conn.close()
         await asyncio.to_thread(_sync_pg)
     elif STORAGE_BACKEND == "sqlite":
         def _sync_sqlite():
@@ -1043,9 +1109,7 @@ async def finalize_scraping_run(run_id: str, status: str) -> None:
     STORAGE_BACKEND = _get_storage_backend()
     if STORAGE_BACKEND == "postgres":
         def _sync_pg():
-            conn = _pg_connect()
-            try:
-                _pg_ensure_schema(conn)
+            with _pg_pooled() as conn:
                 cur = conn.cursor()
                 now = _iso(datetime.utcnow())
                 cur.execute(
@@ -1069,8 +1133,6 @@ async def finalize_scraping_run(run_id: str, status: str) -> None:
                     ),
                 )
                 conn.commit()
-            finally:
-                conn.close()
         await asyncio.to_thread(_sync_pg)
     elif STORAGE_BACKEND == "sqlite":
         def _sync_sqlite():
@@ -1166,9 +1228,7 @@ async def get_run_rows(run_id: str) -> List[Dict[str, Any]]:
     STORAGE_BACKEND = _get_storage_backend()
     if STORAGE_BACKEND == "postgres":
         def _sync_pg():
-            conn = _pg_connect()
-            try:
-                _pg_ensure_schema(conn)
+            with _pg_pooled() as conn:
                 cur = conn.cursor()
                 cur.execute(
                     f"SELECT {', '.join(RUN_PRODUCT_HEADERS)} FROM scraped_products_run WHERE run_id=%s",
@@ -1180,8 +1240,6 @@ async def get_run_rows(run_id: str) -> List[Dict[str, Any]]:
                     d = {h: r[i] for i, h in enumerate(RUN_PRODUCT_HEADERS)}
                     out.append(d)
                 return out
-            finally:
-                conn.close()
         return await asyncio.to_thread(_sync_pg)
     elif STORAGE_BACKEND == "sqlite":
         def _sync_sqlite():
@@ -1230,3 +1288,86 @@ async def get_run_rows(run_id: str) -> List[Dict[str, Any]]:
             rows = _read_all(ws, RUN_PRODUCT_HEADERS)
             return [r for r in rows if str(r.get("run_id")) == str(run_id)]
         return await asyncio.to_thread(_sync_sheets)
+
+
+def _run_rows_batches(run_id: str, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Yield a run's product rows in batches of up to ``chunk_size`` (blocking; see get_run_rows_iter)."""
+    STORAGE_BACKEND = _get_storage_backend()
+    if STORAGE_BACKEND == "postgres":
+        with _pg_pooled() as conn:
+            # Named cursor: rows stay on the server and arrive chunk_size at a time
+            cur = conn.cursor(name="run_export")
+            cur.itersize = chunk_size
+            cur.execute(
+                f"SELECT {', '.join(RUN_PRODUCT_HEADERS)} FROM scraped_products_run WHERE run_id=%s",
+                (run_id,),
+            )
+            while rows := cur.fetchmany(chunk_size):
+                yield [dict(zip(RUN_PRODUCT_HEADERS, r)) for r in rows]
+    elif STORAGE_BACKEND == "sqlite":
+        conn = _sqlite_connect()
+        try:
+            _sqlite_ensure_schema(conn)
+            cur = conn.cursor()
+            cur.execute(
+                f"SELECT {', '.join(RUN_PRODUCT_HEADERS)} FROM scraped_products_run WHERE run_id=?",
+                (run_id,),
+            )
+            while rows := cur.fetchmany(chunk_size):
+                yield [dict(zip(RUN_PRODUCT_HEADERS, r)) for r in rows]
+        finally:
+            conn.close()
+    elif STORAGE_BACKEND == "sheetdb":
+        # SheetDB's search API has no cursor; the filtered result is sliced instead
+        recs = _sheetdb_select("scraped_products_run", {"run_id": run_id})
+        for i in range(0, len(recs), chunk_size):
+            yield [{**_EMPTY_RUN_ROW, **r} for r in recs[i:i + chunk_size]]
+    elif STORAGE_BACKEND == "airtable":
+        tbl = _get_airtable_tables()["products_run"]
+        batch: List[Dict[str, Any]] = []
+        for page in tbl.iterate(formula=f"{{run_id}}='{run_id}'"):
+            batch.extend({**_EMPTY_RUN_ROW, **rec.get("fields", {})} for rec in page)
+            if len(batch) >= chunk_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    else:
+        client = _get_gspread_client()
+        ss = _open_spreadsheet(client)
+        ws = _get_or_create_ws(ss, "scraped_products_run", RUN_PRODUCT_HEADERS)
+        last_col = gspread.utils.rowcol_to_a1(1, len(RUN_PRODUCT_HEADERS)).rstrip("0123456789")
+        start = 1
+        while True:
+            values = ws.get_values(f"A{start}:{last_col}{start + chunk_size - 1}")
+            if not values:
+                break
+            if start == 1 and [h.strip() for h in values[0]] == RUN_PRODUCT_HEADERS:
+                values = values[1:]
+            # run_id is column A; only matching rows are turned into dicts, trailing blanks padded
+            width = len(RUN_PRODUCT_HEADERS)
+            wanted = str(run_id)
+            batch = [
+                dict(zip(RUN_PRODUCT_HEADERS, row + [""] * (width - len(row))))
+                for row in values
+                if row and str(row[0]) == wanted
+            ]
+            if batch:
+                yield batch
+            start += chunk_size
+
+
+async def get_run_rows_iter(run_id: str, chunk_size: int = 5000) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Stream a run's product rows in batches instead of materialising the whole run.
+
+    The backend cursor is driven from one dedicated thread (DB connections and cursors stay on the
+    thread that opened them); each batch is awaited without blocking the event loop.
+    """
+    batches = _run_rows_batches(run_id, chunk_size)
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-rows") as executor:
+        try:
+            while (batch := await loop.run_in_executor(executor, next, batches, None)) is not None:
+                yield batch
+        finally:
+            await loop.run_in_executor(executor, batches.close)
@@ -1,8 +1,12 @@
 from typing import Dict, List, Tuple
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import json
 
+_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9\s]')
+_VOLUME_RE = re.compile(r'(\d+)\s*(ml|l|oz|fl\s*oz)')
+_DIMENSION_RE = re.compile(r'(\d+)\s*x\s*(\d+)\s*(cm|mm|inch|in)')
+
 @dataclass
 class ProductMatch:
     """Product matching result"""
@@ -13,6 +17,14 @@ class ProductMatch:
     confidence: str  # low, medium, high
     reasoning: str
 
+@dataclass
+class _PreparedTarget:
+    """Everything match_product derives from the target name alone"""
+    words: set
+    categories: List[str] = field(default_factory=list)
+    materials: List[str] = field(default_factory=list)
+    size: Dict[str, str] = field(default_factory=dict)
+
 class LLMProductMatcher:
     """Simple rule-based product matcher (can be enhanced with actual LLM later)"""
     
@@ -38,21 +50,21 @@ class LLMProductMatcher:
         """Normalize text for comparison"""
         if not text:
             return ""
-        return re.sub(r'[^a-zA-Z0-9\s]', '', text.lower().strip())
+        return _NON_ALNUM_RE.sub('', text.lower().strip())
     
     def extract_size_info(self, text: str) -> Dict[str, str]:
         """Extract size/capacity information"""
         size_info = {}
         
+        lowered = text.lower()
+        
         # Volume patterns
-        volume_pattern = r'(\d+)\s*(ml|l|oz|fl\s*oz)'
-        volume_match = re.search(volume_pattern, text.lower())
+        volume_match = _VOLUME_RE.search(lowered)
         if volume_match:
             size_info['volume'] = f"{volume_match.group(1)}{volume_match.group(2)}"
         
         # Dimension patterns
-        dimension_pattern = r'(\d+)\s*x\s*(\d+)\s*(cm|mm|inch|in)'
-        dimension_match = re.search(dimension_pattern, text.lower())
+        dimension_match = _DIMENSION_RE.search(lowered)
         if dimension_match:
             size_info['dimensions'] = f"{dimension_match.group(1)}x{dimension_match.group(2)}{dimension_match.group(3)}"
         
@@ -116,9 +128,9 @@ class LLMProductMatcher:
     
     def match_size(self, target_product: str, scraped_title: str) -> bool:
         """Match size/capacity information"""
-        target_size = self.extract_size_info(target_product)
-        scraped_size = self.extract_size_info(scraped_title)
-        
+        return self._sizes_match(self.extract_size_info(target_product), self.extract_size_info(scraped_title))
+    
+    def _sizes_match(self, target_size: Dict[str, str], scraped_size: Dict[str, str]) -> bool:
         if not target_size or not scraped_size:
             return True  # No size info to compare
         
@@ -132,25 +144,56 @@ class LLMProductMatcher:
         
         return True
     
+    def prepare_target(self, target_product: str) -> _PreparedTarget:
+        """Tokenize and classify the target product once so it can be matched against many candidates"""
+        target_norm = self.normalize_text(target_product)
+        return _PreparedTarget(
+            words=set(target_norm.split()),
+            categories=[c for c, keywords in self.category_keywords.items() if any(k in target_norm for k in keywords)],
+            materials=[m for m, keywords in self.material_keywords.items() if any(k in target_norm for k in keywords)],
+            size=self.extract_size_info(target_product),
+        )
+    
     def match_product(self, target_product: str, scraped_product: dict) -> ProductMatch:
         """Match a target product with a scraped product"""
+        return self._match_prepared(self.prepare_target(target_product), scraped_product)
+    
+    def match_batch(self, target_product: str, scraped_products: List[dict]) -> List[ProductMatch]:
+        """Match one target against many scraped products, preparing the target only once"""
+        target = self.prepare_target(target_product)
+        return [self._match_prepared(target, p) for p in scraped_products]
+    
+    def _match_prepared(self, target: _PreparedTarget, scraped_product: dict) -> ProductMatch:
         scraped_title = scraped_product.get('title', '')
         scraped_brand = scraped_product.get('brand', '')
+        scraped_norm = self.normalize_text(scraped_title)
         
         # Calculate text similarity
-        similarity = self.calculate_text_similarity(target_product, scraped_title)
+        scraped_words = set(scraped_norm.split())
+        if not target.words or not scraped_words:
+            similarity = 0.0
+        else:
+            similarity = len(target.words & scraped_words) / len(target.words | scraped_words)
         
         # Check category match
-        category_match, category = self.match_category(target_product, scraped_title)
+        category_match, category = False, "unknown"
+        for c in target.categories:
+            if any(keyword in scraped_norm for keyword in self.category_keywords[c]):
+                category_match, category = True, c
+                break
         
         # Check material match
-        material_match, material = self.match_material(target_product, scraped_title)
+        material_match, material = False, "unknown"
+        for m in target.materials:
+            if any(keyword in scraped_norm for keyword in self.material_keywords[m]):
+                material_match, material = True, m
+                break
         
         # Check brand match (if available)
         brand_match = self.match_brand("", scraped_brand)  # We don't have target brand
         
         # Check size match
-        size_match = self.match_size(target_product, scraped_title)
+        size_match = self._sizes_match(target.size, self.extract_size_info(scraped_title))
         
         # Calculate overall score
         score = similarity